@@ -0,0 +1,37 @@
+# Benchmark: calc expressions through eval() vs. the cached safe evaluator
+# Run: python benchmarks/bench_calc.py [rounds]
+
+import math, os, sys, timeit
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mathexpr
+
+EXPRESSIONS = [
+    "1 + 2 * 3",
+    "sqrt(25) + log(10) * sin(pi / 4)",
+    "pow(2, 10) - factorial(10) / gcd(54, 24)",
+    "degrees(atan2(1, 1)) + hypot(3, 4) ** 2 - exp(1.5) % 7",
+]
+
+def old_eval(expression):
+    return eval(expression, {"__builtins__": None}, math.__dict__)
+
+def safe_cold(expression):
+    mathexpr.compile_expression.cache_clear()
+    return mathexpr.evaluate(expression)
+
+def safe_cached(expression):
+    return mathexpr.evaluate(expression)
+
+def main(rounds=20000):
+    for expression in EXPRESSIONS:
+        assert math.isclose(old_eval(expression), mathexpr.evaluate(expression))
+        print(expression)
+        for label, func in (("eval() every time", old_eval),
+                            ("safe evaluator, cache cleared", safe_cold),
+                            ("safe evaluator, cached code", safe_cached)):
+            seconds = timeit.timeit(lambda: func(expression), number=rounds) / rounds
+            print(f"  {label:<30} {seconds * 1e6:>8.2f} us")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,43 @@
+# Benchmark: fastcopy.CopyJob vs shutil.copytree on a synthetic tree
+# Run: python benchmarks/bench_copy.py [small_files] [huge_files] [huge_mb]
+
+import os, shutil, sys, tempfile, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fastcopy
+
+def build_tree(root, small_files, huge_files, huge_mb):
+    for i in range(small_files):
+        folder = os.path.join(root, f"dir{i % 50}", f"sub{i % 7}")
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, f"file{i}.txt"), "wb") as f:
+            f.write(os.urandom(512 + i % 4096))
+    block = os.urandom(1024 * 1024)
+    for i in range(huge_files):
+        with open(os.path.join(root, f"huge{i}.bin"), "wb") as f:
+            for _ in range(huge_mb):
+                f.write(block)
+
+def timed(label, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:>8.2f} s")
+    return elapsed
+
+def main(small_files=20000, huge_files=2, huge_mb=512):
+    with tempfile.TemporaryDirectory() as workdir:
+        src = os.path.join(workdir, "src")
+        print(f"building {small_files} small + {huge_files} x {huge_mb} MiB files in {workdir}")
+        build_tree(src, small_files, huge_files, huge_mb)
+
+        baseline = timed("shutil.copytree", lambda: shutil.copytree(src, os.path.join(workdir, "a")))
+        for workers in (1, 4, fastcopy.DEFAULT_WORKERS):
+            dst = os.path.join(workdir, f"b{workers}")
+            job = fastcopy.CopyJob(workers, show_progress=False)
+            elapsed = timed(f"fastcopy ({workers} workers)", lambda: job.run(src, dst))
+            print(f"{'':<32} {baseline / elapsed:>8.2f}x, {job.files} files, {len(job.errors)} errors")
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:4]]
+    main(*args)
@@ -0,0 +1,34 @@
+# Benchmark: prompt branch lookup via `git rev-parse` vs. reading .git directly
+# Run from inside a git repository: python benchmarks/bench_git_head.py
+
+import os, subprocess, sys, timeit
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gitinfo import find_repo, read_head
+
+def branch_subprocess():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
+            stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except subprocess.CalledProcessError:
+        return "no-branch"
+
+def branch_cold():
+    find_repo.cache_clear()
+    return read_head(os.getcwd())
+
+def branch_cached():
+    return read_head(os.getcwd())
+
+def main(rounds=200):
+    print(f"branch (git): {branch_subprocess()} | branch (gitinfo): {branch_cached()}")
+    for label, func in (("git rev-parse subprocess", branch_subprocess),
+                        ("gitinfo, cold repo lookup", branch_cold),
+                        ("gitinfo, cached repo root", branch_cached)):
+        seconds = timeit.timeit(func, number=rounds) / rounds
+        print(f"{label:<28} {seconds * 1e6:>10.1f} us per prompt")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
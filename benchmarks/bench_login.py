@@ -0,0 +1,30 @@
+# Benchmark: login (password verification) latency at different KDF cost settings
+# Run: python benchmarks/bench_login.py [rounds]
+
+import os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from passwords import hash_password, verify_password
+
+SETTINGS = [
+    ("scrypt", (2 ** 12, 8, 1)),
+    ("scrypt", (2 ** 14, 8, 1)),
+    ("scrypt", (2 ** 15, 8, 1)),
+    ("scrypt", (2 ** 16, 8, 1)),
+    ("pbkdf2_sha256", (100000,)),
+    ("pbkdf2_sha256", (600000,)),
+    ("pbkdf2_sha256", (1200000,)),
+]
+
+def main(rounds=5):
+    print(f"{'scheme':<15} {'params':<20} {'verify (ms)':>12}")
+    for scheme, params in SETTINGS:
+        stored = hash_password("correct horse", scheme, params)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            assert verify_password("correct horse", stored)[0]
+        elapsed = (time.perf_counter() - start) / rounds
+        print(f"{scheme:<15} {str(params):<20} {elapsed * 1000:>12.1f}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
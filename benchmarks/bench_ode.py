@@ -0,0 +1,66 @@
+# Benchmark: `differential` via dsolve (then evaluated on a grid) vs. numeric integration
+# Run: python benchmarks/bench_ode.py [points]
+
+import os, sys, tempfile, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import scipy.integrate  # noqa: F401  (imported up front so the first timing is not an import)
+from sympy import Eq, Function, lambdify, solve, srepr, sympify
+from sympy.abc import x
+from sympy.parsing.sympy_parser import parse_expr
+
+import odesolve, symbolic
+
+y = Function("y")
+# (equation, interval, initial values y(x0), y'(x0), ...)
+CASES = [
+    ("Derivative(y(x), x, x) + y(x) = 0", (0.0, 20.0), [0.0, 1.0]),
+    ("Derivative(y(x), x) = -2*x*y(x)", (0.0, 3.0), [1.0]),
+    ("Derivative(y(x), x) = -50*(y(x) - cos(x))", (0.0, 10.0), [0.0]),
+    ("Derivative(y(x), x, x) + Derivative(y(x), x)/10 + sin(y(x)) = 0", (0.0, 20.0), [1.0, 0.0]),
+]
+TIMEOUT = 20
+
+def parse(text):
+    lhs, rhs = text.split("=")
+    return Eq(parse_expr(lhs.strip(), evaluate=False), parse_expr(rhs.strip(), evaluate=False))
+
+def symbolic_path(engine, equation, interval, initial, grid):
+    """dsolve, fit the constants to the initial values, then evaluate on the grid."""
+    general = sympify(engine.run("dsolve", [srepr(equation), srepr(y(x))], TIMEOUT)).rhs
+    constants = sorted(general.free_symbols - {x}, key=str)
+    conditions = [general.diff(x, k).subs(x, interval[0]) - value for k, value in enumerate(initial)]
+    particular = general.subs(solve(conditions, constants, dict=True)[0])
+    return np.broadcast_to(lambdify(x, particular, "numpy")(grid), grid.shape).astype(float)
+
+def numeric_path(equation, interval, initial, points, method):
+    system = odesolve.FirstOrderSystem(equation, y, x)
+    grid, states, _, _ = system.integrate(*interval, initial, method, points)
+    return grid, states[0]
+
+def main(points=1001):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = symbolic.SymbolicEngine(os.path.join(tmp, "memo.sqlite3"))
+        engine.run("diff", [srepr(x), srepr(x)])  # start the worker outside the timings
+        for text, interval, initial in CASES:
+            equation = parse(text)
+            print(text)
+            grid = np.linspace(*interval, points)
+            start = time.perf_counter()
+            try:
+                exact = symbolic_path(engine, equation, interval, initial, grid)
+                print(f"  {'dsolve + lambdify':<24} {time.perf_counter() - start:>8.3f} s")
+            except (symbolic.SymbolicTimeout, symbolic.SymbolicError, IndexError) as e:
+                exact = None
+                print(f"  {'dsolve + lambdify':<24} {'failed':>8}   ({str(e).splitlines()[0][:60]})")
+            for method in ("nonstiff", "stiff"):
+                start = time.perf_counter()
+                _, values = numeric_path(equation, interval, initial, points, method)
+                seconds = time.perf_counter() - start
+                error = "" if exact is None else f"   max |error| {np.max(np.abs(values - exact)):.2e}"
+                print(f"  {'solve_ivp ' + odesolve.resolve_method(method):<24} {seconds:>8.3f} s{error}")
+        engine.stop()
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1001)
@@ -0,0 +1,164 @@
+# File hashing and duplicate detection
+
+import hashlib, os, sqlite3
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from settings import cache_dir
+from shared import DEFAULT_WORKERS
+
+READ_BUFFER = 1024 * 1024
+EDGE = 64 * 1024
+ALGORITHMS = {"md5": hashlib.md5, "sha1": hashlib.sha1, "sha256": hashlib.sha256, "blake2": hashlib.blake2b}
+DUPES_ALGORITHM = "blake2"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    dev      INTEGER NOT NULL,
+    inode    INTEGER NOT NULL,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    kind     TEXT NOT NULL,
+    digest   TEXT NOT NULL,
+    PRIMARY KEY (dev, inode, kind)
+);
+"""
+
+def hash_file(path, algorithm="sha256"):
+    """Full-content digest, read through one reusable 1 MiB buffer."""
+    digest = ALGORITHMS[algorithm]()
+    buffer = bytearray(READ_BUFFER)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            digest.update(view[:n])
+    return digest.hexdigest()
+
+def hash_edges(path, size, algorithm=DUPES_ALGORITHM):
+    """Digest of the first and last 64 KiB; covers the whole file when it is small."""
+    digest = ALGORITHMS[algorithm]()
+    with open(path, "rb") as f:
+        digest.update(f.read(EDGE))
+        if size > EDGE:
+            f.seek(max(EDGE, size - EDGE))
+            digest.update(f.read(EDGE))
+    return digest.hexdigest()
+
+class HashCache:
+    """Digests stored on disk, valid while a file's (device, inode, size, mtime) is unchanged.
+
+    Only the calling thread touches the database; workers just hash.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(cache_dir(), "hashes.sqlite3")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=10)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+        self.pending = []
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, info, kind):
+        row = self.db.execute("SELECT size, mtime_ns, digest FROM hashes WHERE dev = ? AND inode = ? AND kind = ?",
+                              (info.st_dev, info.st_ino, kind)).fetchone()
+        if row and row[0] == info.st_size and row[1] == info.st_mtime_ns:
+            self.hits += 1
+            return row[2]
+        self.misses += 1
+        return None
+
+    def put(self, info, kind, digest):
+        self.pending.append((info.st_dev, info.st_ino, info.st_size, info.st_mtime_ns, kind, digest))
+
+    def flush(self):
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?)", self.pending)
+        self.pending = []
+
+    def close(self):
+        self.flush()
+        self.db.close()
+
+def cached_digests(items, compute, kind, cache, pool):
+    """Yields (item, digest) for (path, stat) items in order, hashing cache misses on `pool`."""
+    def job(item):
+        path, info = item
+        known = cache.get(info, kind)
+        return known, (None if known else pool.submit(compute, path, info))
+
+    # look every item up first so the pool is busy while results are consumed
+    jobs = [(item, *job(item)) for item in items]
+    for item, known, future in jobs:
+        if known:
+            yield item, known
+            continue
+        try:
+            digest = future.result()
+        except OSError as e:
+            yield item, e
+            continue
+        cache.put(item[1], kind, digest)
+        yield item, digest
+
+def checksums(paths, cache, algorithm="sha256", workers=DEFAULT_WORKERS):
+    """Yields (path, digest or OSError) in input order, hashing files in parallel."""
+    items, errors = [], {}
+    for path in paths:
+        try:
+            items.append((path, os.stat(path)))
+        except OSError as e:
+            errors[path] = e
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hash") as pool:
+        results = cached_digests(items, lambda path, info: hash_file(path, algorithm), algorithm, cache, pool)
+        for path in paths:
+            if path in errors:
+                yield path, errors[path]
+            else:
+                _, digest = next(results)
+                yield path, digest
+
+def find_duplicates(paths, cache, min_size=1, workers=DEFAULT_WORKERS):
+    """Groups identical files: by size, then by first/last 64 KiB, then by full content.
+
+    Each stage only looks at files that still collide, so most files are never
+    read at all. Hard links to one inode count once. Returns (size, [paths])
+    groups, largest reclaimable space first.
+    """
+    by_size = defaultdict(dict)
+    for path in paths:
+        try:
+            info = os.stat(path, follow_symlinks=False)
+        except OSError:
+            continue
+        if info.st_size >= min_size:
+            by_size[info.st_size].setdefault((info.st_dev, info.st_ino), (path, info))
+    candidates = [list(group.values()) for group in by_size.values() if len(group) > 1]
+
+    groups = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dupes") as pool:
+        edges = defaultdict(list)
+        items = [item for group in candidates for item in group]
+        for item, digest in cached_digests(items, lambda path, info: hash_edges(path, info.st_size), "edges", cache, pool):
+            if isinstance(digest, str):
+                edges[(item[1].st_size, digest)].append(item)
+
+        full = defaultdict(list)
+        rest = []
+        for (size, _), group in edges.items():
+            if len(group) < 2:
+                continue
+            if size <= 2 * EDGE:
+                # the edge hash already covered every byte
+                groups.append((size, [path for path, _ in group]))
+            else:
+                rest.extend(group)
+        for item, digest in cached_digests(rest, lambda path, info: hash_file(path, DUPES_ALGORITHM), DUPES_ALGORITHM, cache, pool):
+            if isinstance(digest, str):
+                full[(item[1].st_size, digest)].append(item[0])
+        groups.extend((size, paths) for (size, _), paths in full.items() if len(paths) > 1)
+    groups.sort(key=lambda group: group[0] * (len(group[1]) - 1), reverse=True)
+    return groups
@@ -1 +0,0 @@
-current_terminal_layout = 5
@@ -0,0 +1,122 @@
+# Disk usage with a persistent per-directory size index
+
+import json, os, sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from settings import cache_dir
+from shared import DEFAULT_WORKERS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path      TEXT PRIMARY KEY,
+    mtime_ns  INTEGER NOT NULL,
+    own_bytes INTEGER NOT NULL,
+    own_files INTEGER NOT NULL,
+    subdirs   TEXT NOT NULL
+);
+"""
+
+def index_path():
+    return os.path.join(cache_dir(), "du.sqlite3")
+
+def scan(path):
+    """Lists one directory: (bytes and count of its own files, names of its subdirectories)."""
+    own_bytes = own_files = 0
+    subdirs = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                    else:
+                        own_bytes += entry.stat(follow_symlinks=False).st_size
+                        own_files += 1
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return own_bytes, own_files, subdirs
+
+class SizeIndex:
+    """Directory sizes cached on disk, keyed by path and the directory's mtime.
+
+    A directory is rescanned only when its own mtime changed (an entry was
+    added, removed or renamed); unchanged directories cost a single stat.
+    Files rewritten in place do not touch the directory mtime, so `du --rescan`
+    forces a full walk when exact figures are needed.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or index_path()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=10)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+        self.scanned = 0
+        self.reused = 0
+
+    def cached(self, paths):
+        rows = {}
+        for start in range(0, len(paths), 500):
+            chunk = paths[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            for row in self.db.execute(f"SELECT path, mtime_ns, own_bytes, own_files, subdirs FROM dirs WHERE path IN ({marks})", chunk):
+                rows[row[0]] = row[1:]
+        return rows
+
+    def visit(self, path, cached, rescan):
+        """Runs on a worker: returns (path, mtime, own_bytes, own_files, subdirs, fresh)."""
+        try:
+            mtime = os.stat(path, follow_symlinks=False).st_mtime_ns
+        except OSError:
+            return path, None, 0, 0, [], False
+        if not rescan and cached and cached[0] == mtime:
+            return path, mtime, cached[1], cached[2], json.loads(cached[3]), False
+        own_bytes, own_files, subdirs = scan(path)
+        return path, mtime, own_bytes, own_files, subdirs, True
+
+    def measure(self, root, workers=DEFAULT_WORKERS, rescan=False):
+        """Returns {dir: (total_bytes, total_files, subdir paths)} for every directory under root.
+
+        The tree is walked level by level; each level's directories are
+        checked (and rescanned if changed) concurrently.
+        """
+        root = os.path.abspath(root)
+        nodes = {}
+        order = []
+        updates = []
+        frontier = [root]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="du") as pool:
+            while frontier:
+                cached = self.cached(frontier)
+                results = pool.map(lambda p: self.visit(p, cached.get(p), rescan), frontier)
+                frontier = []
+                for path, mtime, own_bytes, own_files, names, fresh in results:
+                    if mtime is None:
+                        continue
+                    children = [os.path.join(path, name) for name in names]
+                    nodes[path] = [own_bytes, own_files, children]
+                    order.append(path)
+                    frontier.extend(children)
+                    if fresh:
+                        self.scanned += 1
+                        updates.append((path, mtime, own_bytes, own_files, json.dumps(names)))
+                    else:
+                        self.reused += 1
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?, ?)", updates)
+
+        # children always come after their parent in `order`, so fold totals bottom-up
+        totals = {}
+        for path in reversed(order):
+            own_bytes, own_files, children = nodes[path]
+            total_bytes, total_files = own_bytes, own_files
+            for child in children:
+                if child in totals:
+                    total_bytes += totals[child][0]
+                    total_files += totals[child][1]
+            totals[path] = (total_bytes, total_files, [c for c in children if c in nodes])
+        return totals
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,352 @@
+# Line Editor
+
+import mmap, os, random, tempfile
+from bisect import bisect_left
+from array import array
+from collections import deque
+from rich.console import Console
+
+console = Console()
+INDEX_CHUNK = 64 * 1024
+COPY_CHUNK = 1024 * 1024
+UNDO_LIMIT = 100
+
+class Original:
+    """The file as opened, memory-mapped read-only.
+
+    Only a sparse index is built up front: the number of newlines before each
+    64 KiB chunk. A line is located by bisecting that index and scanning
+    forward inside one chunk, so text is read only for lines that are shown.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.open()
+        self.newlines_before = array("q")
+        self.last = (0, 0)
+        newlines = 0
+        for pos in range(0, self.size, INDEX_CHUNK):
+            self.newlines_before.append(newlines)
+            newlines += self.mm[pos:pos + INDEX_CHUNK].count(b"\n")
+        self.ends_with_newline = self.size == 0 or self.mm[self.size - 1:self.size] == b"\n"
+        self.lines = newlines + (0 if self.ends_with_newline else 1)
+
+    def offset(self, line):
+        """Byte offset where `line` (0-based) starts; the file size for one past the end."""
+        if line == 0:
+            return 0
+        if line >= self.lines:
+            return self.size
+        chunk = bisect_left(self.newlines_before, line) - 1
+        known, pos = self.newlines_before[chunk], chunk * INDEX_CHUNK - 1
+        # sequential lookups (paging, saving) continue from the previous answer
+        if self.last[0] <= line and self.last[0] > known:
+            known, pos = self.last[0], self.last[1] - 1
+        for _ in range(line - known):
+            pos = self.mm.find(b"\n", pos + 1)
+        self.last = (line, pos + 1)
+        return pos + 1
+
+    def read(self, start, count):
+        pos = self.offset(start)
+        for _ in range(count):
+            end = self.mm.find(b"\n", pos)
+            end = self.size if end == -1 else end
+            yield self.mm[pos:end].decode("utf-8", "surrogateescape")
+            pos = end + 1
+
+    def open(self):
+        self.file = open(self.path, "rb")
+        self.size = os.fstat(self.file.fileno()).st_size
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+
+    def close(self):
+        if self.size:
+            self.mm.close()
+        self.file.close()
+
+class Added:
+    """Append-only store for every line typed during the session."""
+
+    def __init__(self):
+        self.lines = []
+
+    def read(self, start, count):
+        return iter(self.lines[start:start + count])
+
+class Node:
+    """Immutable treap node holding one piece: `count` lines of `source` starting at `start`.
+
+    Nodes are never modified, so every edit produces a new root that shares
+    most of the tree with the old one; keeping old roots is the undo history.
+    """
+    __slots__ = ("source", "start", "count", "priority", "left", "right", "size")
+
+    def __init__(self, source, start, count, priority, left=None, right=None):
+        self.source = source
+        self.start = start
+        self.count = count
+        self.priority = priority
+        self.left = left
+        self.right = right
+        self.size = count + size(left) + size(right)
+
+def size(node):
+    return node.size if node else 0
+
+def split(node, k):
+    """Splits into (first k lines, rest) in O(log n), cutting a piece in two when needed."""
+    if node is None:
+        return None, None
+    before = size(node.left)
+    if k <= before:
+        left, right = split(node.left, k)
+        return left, Node(node.source, node.start, node.count, node.priority, right, node.right)
+    if k >= before + node.count:
+        left, right = split(node.right, k - before - node.count)
+        return Node(node.source, node.start, node.count, node.priority, node.left, left), right
+    cut = k - before
+    return (Node(node.source, node.start, cut, node.priority, node.left, None),
+            Node(node.source, node.start + cut, node.count - cut, node.priority, None, node.right))
+
+def merge(left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        return Node(left.source, left.start, left.count, left.priority, left.left, merge(left.right, right))
+    return Node(right.source, right.start, right.count, right.priority, merge(left, right.left), right.right)
+
+def pieces(node, lo, hi, offset=0):
+    """Yields (source, start, count) for lines [lo, hi) in document order."""
+    if node is None or hi <= offset or lo >= offset + node.size:
+        return
+    yield from pieces(node.left, lo, hi, offset)
+    first = offset + size(node.left)
+    a, b = max(lo, first), min(hi, first + node.count)
+    if a < b:
+        yield node.source, node.start + a - first, b - a
+    yield from pieces(node.right, lo, hi, first + node.count)
+
+class Document:
+    """A file as a piece table over (mmap'd original, added lines), kept in a persistent treap."""
+
+    def __init__(self, path):
+        self.path = path
+        self.original = Original(path) if os.path.exists(path) else None
+        self.added = Added()
+        self.root = None
+        if self.original and self.original.lines:
+            self.root = Node(self.original, 0, self.original.lines, random.random())
+        self.history = deque(maxlen=UNDO_LIMIT)
+        self.dirty = False
+
+    def __len__(self):
+        return size(self.root)
+
+    def lines(self, lo, hi):
+        for source, start, count in pieces(self.root, lo, hi):
+            yield from source.read(start, count)
+
+    def edit(self, root):
+        self.history.append(self.root)
+        self.root = root
+        self.dirty = True
+
+    def insert(self, at, lines):
+        if not lines:
+            return
+        piece = Node(self.added, len(self.added.lines), len(lines), random.random())
+        self.added.lines.extend(lines)
+        left, right = split(self.root, at)
+        self.edit(merge(merge(left, piece), right))
+
+    def delete(self, lo, hi):
+        left, rest = split(self.root, lo)
+        _, right = split(rest, hi - lo)
+        self.edit(merge(left, right))
+
+    def replace(self, at, line):
+        left, rest = split(self.root, at)
+        _, right = split(rest, 1)
+        piece = Node(self.added, len(self.added.lines), 1, random.random())
+        self.added.lines.append(line)
+        self.edit(merge(merge(left, piece), right))
+
+    def undo(self):
+        if not self.history:
+            return False
+        self.root = self.history.pop()
+        self.dirty = True
+        return True
+
+    def write_to(self, f):
+        # an original last line without "\n" gets one only if more text follows it
+        pending_newline = False
+        for source, start, count in pieces(self.root, 0, len(self)):
+            if pending_newline:
+                f.write(b"\n")
+                pending_newline = False
+            if source is self.added:
+                for line in source.read(start, count):
+                    f.write(line.encode("utf-8", "surrogateescape") + b"\n")
+                continue
+            a, b = source.offset(start), source.offset(start + count)
+            for pos in range(a, b, COPY_CHUNK):
+                f.write(source.mm[pos:min(pos + COPY_CHUNK, b)])
+            if b == source.size and not source.ends_with_newline:
+                pending_newline = True
+
+    def save(self):
+        """Writes to a temp file next to the target, fsyncs, then renames it into place.
+
+        Windows cannot replace a file that is open and mapped, so there the
+        original is released for the rename and the saved file is reopened as
+        the new original; the undo history starts over after such a save.
+        """
+        folder = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(prefix=".edit-", suffix=".tmp", dir=folder)
+        release = os.name == "nt" and self.original is not None
+        try:
+            with os.fdopen(fd, "wb") as f:
+                self.write_to(f)
+                f.flush()
+                os.fsync(f.fileno())
+            if os.path.exists(self.path):
+                os.chmod(tmp, os.stat(self.path).st_mode & 0o7777)
+            if release:
+                self.original.close()
+            try:
+                os.replace(tmp, self.path)
+            except BaseException:
+                if release:
+                    # the old file is still in place, so the existing pieces stay valid
+                    self.original.open()
+                raise
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        if release:
+            self.original = Original(self.path)
+            self.added = Added()
+            self.root = Node(self.original, 0, self.original.lines, random.random()) if self.original.lines else None
+            self.history.clear()
+        # elsewhere pieces (and undo snapshots) keep reading the old mapping, which stays valid after the rename
+        self.dirty = False
+
+    def close(self):
+        if self.original:
+            self.original.close()
+
+HELP = """Commands (line numbers start at 1):
+  p [N [M]]   print lines N..M (default: the current page)
+  n           print the next page
+  a           append lines at the end; finish with a line containing only '.'
+  i N         insert lines before line N; finish with '.'
+  c N         replace line N
+  d N [M]     delete lines N..M
+  u           undo the last change
+  w           save
+  q / q!      quit / quit without saving
+  wq / exit   save and quit"""
+
+class LineEditor:
+    def __init__(self, path):
+        self.doc = Document(path)
+        self.page = max(10, console.size.height - 6)
+        self.top = 0
+
+    def show(self, lo, hi):
+        hi = min(hi, len(self.doc))
+        width = len(str(hi))
+        for number, line in enumerate(self.doc.lines(lo, hi), lo + 1):
+            console.print(f"[dim]{number:>{width}}[/dim] ", end="")
+            console.print(line, markup=False, highlight=False)
+        if lo >= hi:
+            console.print("(no lines)", style="dim")
+        self.top = hi
+
+    def read_block(self):
+        lines = []
+        while True:
+            line = input()
+            if line == ".":
+                return lines
+            lines.append(line)
+
+    def line_range(self, parts, default=None):
+        """1-based 'N [M]' -> 0-based half-open [lo, hi), validated against the document."""
+        if len(parts) < 2 and default is None:
+            raise ValueError("line number required")
+        lo = int(parts[1]) if len(parts) > 1 else default
+        hi = int(parts[2]) if len(parts) > 2 else lo
+        if not 1 <= lo <= hi <= len(self.doc):
+            raise ValueError(f"line out of range (1-{len(self.doc)})")
+        return lo - 1, hi
+
+    def run(self):
+        name = self.doc.path
+        if self.doc.original is None:
+            console.print("File not found. Creating a new file.", style="bold yellow")
+        console.print(f"Editing '{name}' ({len(self.doc)} lines). Type 'h' for help.", style="bold cyan", markup=False)
+        self.show(0, self.page)
+        try:
+            while True:
+                parts = input("edit> ").split()
+                if not parts:
+                    continue
+                command = parts[0]
+                try:
+                    if command == "h":
+                        console.print(HELP, style="cyan", markup=False)
+                    elif command == "p":
+                        if len(parts) > 1:
+                            lo, hi = self.line_range(parts)
+                            self.show(lo, hi)
+                        else:
+                            self.show(max(0, self.top - self.page), self.top or self.page)
+                    elif command == "n":
+                        self.show(self.top, self.top + self.page)
+                    elif command == "a":
+                        self.doc.insert(len(self.doc), self.read_block())
+                    elif command == "i":
+                        at = int(parts[1]) - 1
+                        if not 0 <= at <= len(self.doc):
+                            raise ValueError(f"line out of range (1-{len(self.doc) + 1})")
+                        self.doc.insert(at, self.read_block())
+                    elif command == "c":
+                        lo, _ = self.line_range(parts[:2])
+                        self.doc.replace(lo, input())
+                    elif command == "d":
+                        lo, hi = self.line_range(parts)
+                        self.doc.delete(lo, hi)
+                        console.print(f"Deleted {hi - lo} line(s).", style="bold yellow")
+                    elif command == "u":
+                        if not self.doc.undo():
+                            console.print("Nothing to undo.", style="bold yellow")
+                    elif command == "w":
+                        self.doc.save()
+                        console.print(f"File '{name}' saved.", style="bold green", markup=False)
+                    elif command in ("wq", "exit"):
+                        self.doc.save()
+                        console.print(f"File '{name}' saved.", style="bold green", markup=False)
+                        return
+                    elif command == "q":
+                        if self.doc.dirty:
+                            console.print("Unsaved changes: 'w' to save or 'q!' to discard.", style="bold yellow")
+                            continue
+                        return
+                    elif command == "q!":
+                        return
+                    else:
+                        console.print(f"Unknown command '{command}'. Type 'h' for help.", style="bold red", markup=False)
+                except (ValueError, IndexError) as e:
+                    console.print(f"edit: {e or 'missing argument'}", style="bold red", markup=False)
+                except OSError as e:
+                    console.print(f"edit: {e}", style="bold red", markup=False)
+        except (EOFError, KeyboardInterrupt):
+            console.print()
+        finally:
+            self.doc.close()
@@ -1,27 +1,39 @@
-from sympy import symbols, sympify, Eq, solve, pretty, Function, dsolve, Derivative, simplify, pretty_print
+from sympy import symbols, sympify, Eq, pretty, Function, Derivative, simplify, pretty_print, srepr, Float
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 from rich.prompt import Prompt
+from rich.table import Table
 from sympy.parsing.sympy_parser import parse_expr
 import re
 from sympy.abc import x
+import numpy as np
+import odesolve
+import symbolic
 
 console = Console()
 
+TABLE_ROWS = 21
+
 class Equations:
     def solve_equation(self, args):
         if not args:
-            console.print("Usage: equation <equation1> [; <equation2>; ...]", style="bold red")
+            console.print("Usage: equation <equation1> [; <equation2>; ...] [--numeric] [--timeout S]", style="bold red", markup=False)
             return
 
         try:
+            args, timeout = symbolic.pop_timeout(args)
+            numeric = "--numeric" in args
+            args = [arg for arg in args if arg != "--numeric"]
             # Join args and split by semicolon for multiple equations
             input_str = " ".join(args)
             raw_equations = [eq.strip() for eq in input_str.split(';') if eq.strip()]
 
-            # Extract all variable names from input string
-            symbol_names = sorted(set(re.findall(r'[a-zA-Z_]\w*', input_str)))
+            # Extract all variable names from input string; a name is left to sympy as a
+            # function only where it is called, so cos(x) works and gamma, N or S stay symbols
+            names = re.findall(r'([a-zA-Z_]\w*)\s*(\()?', input_str)
+            called = {name for name, paren in names if paren}
+            symbol_names = sorted({name for name, _ in names} - called)
             sym_vars_dict = {name: symbols(name) for name in symbol_names}
 
             # Parse equations
@@ -36,8 +48,8 @@ class Equations:
                     lhs_expr = sympify(eq_str, locals=sym_vars_dict)
                     equations.append(Eq(lhs_expr, 0))
 
-            # Infer variables from equations
-            vars_in_equations = list(set().union(*[eq.free_symbols for eq in equations]))
+            # Infer variables from equations (sorted, so the same system always gives the same memo key)
+            vars_in_equations = sorted(set().union(*[eq.free_symbols for eq in equations]), key=str)
 
             # Limit number of variables if underdetermined
             if len(equations) < len(vars_in_equations):
@@ -45,8 +57,25 @@ class Equations:
             else:
                 vars_to_solve = vars_in_equations
 
-            # Solve the system of equations
-            solutions = solve(equations, vars_to_solve, dict=True)
+            # Solve exactly in the symbolic worker (memoized, cancellable); numerically
+            # with --numeric or once the symbolic time budget runs out
+            method = "exact (sympy)"
+            if not numeric:
+                try:
+                    solutions = symbolic.engine.run("solve", [[srepr(eq) for eq in equations], [srepr(v) for v in vars_to_solve]], timeout)
+                    solutions = [{sympify(k): sympify(v) for k, v in solution} for solution in solutions]
+                except symbolic.SymbolicTimeout:
+                    console.print(f"Exact solve took longer than {timeout:g}s, switching to numeric solving.", style="bold yellow")
+                    numeric = True
+                except symbolic.SymbolicError as e:
+                    if not str(e).startswith("NotImplementedError"):
+                        raise
+                    console.print("No closed-form solution, switching to numeric solving.", style="bold yellow")
+                    numeric = True
+            if numeric:
+                import numsolve
+                solutions, method = numsolve.solve(equations, vars_to_solve)
+                solutions = [{k: Float(v) for k, v in solution.items()} for solution in solutions]
 
             # Format output
             if not solutions:
@@ -64,6 +93,7 @@ class Equations:
                     Text.from_markup(
                         f"[bold cyan]System of Equations:[/bold cyan]\n{pretty_eqs}"
                         f"\n\n[bold white]Solutions:[/bold white]\n{pretty_solutions.strip()}"
+                        f"\n\n[dim]Method: {method}[/dim]"
                     ),
                     title="[bold magenta]Equation Solver[/bold magenta]",
                     border_style="bright_blue"
@@ -93,6 +123,15 @@ class Equations:
             title="📝 How to Enter", border_style="blue"
         ))
 
+        try:
+            args, timeout = symbolic.pop_timeout(args)
+            options = odesolve.parse_options(args)
+        except (ValueError, IndexError) as e:
+            console.print(f"Error: {e}", style="bold red", markup=False)
+            console.print("Usage: differential [--timeout S] [--numeric --from A --to B --init y0,y0' ... "
+                          "--method auto|stiff|nonstiff|RK45|DOP853|BDF|Radau|LSODA --points N --out FILE.csv --plot]",
+                          style="bold red", markup=False)
+            return
         user_input = Prompt.ask("[green]📥 Enter your differential equation")
 
         y = Function('y')
@@ -103,7 +142,15 @@ class Equations:
             rhs = parse_expr(rhs_str.strip(), evaluate=False)
 
             equation = Eq(lhs, rhs)
-            solution = dsolve(equation, y(x))
+            if options["numeric"]:
+                self.integrate_differential(equation, y, options)
+                return
+            try:
+                solution = sympify(symbolic.engine.run("dsolve", [srepr(equation), srepr(y(x))], timeout))
+            except (symbolic.SymbolicTimeout, symbolic.SymbolicError):
+                console.print("No closed-form solution was found; pass --numeric with --from/--to/--init "
+                              "to integrate it numerically.", style="bold yellow", markup=False)
+                raise
 
             console.print(Panel.fit("[bold green]✅ Solved Successfully![/bold green]", border_style="green"))
 
@@ -119,4 +166,42 @@ class Equations:
                 f"[red]❌ Error:[/red] {str(e)}\n"
                 "Please ensure your equation is in the correct format.",
                 title="⚠️ Invalid Input", border_style="red"
-            ))
\ No newline at end of file
+            ))
+    def integrate_differential(self, equation, y, options):
+        """Integrates an initial-value problem with scipy and shows a table, CSV file or plot."""
+        console = Console()
+        system = odesolve.FirstOrderSystem(equation, y, x)
+        start = options["start"] if options["start"] is not None else float(Prompt.ask("[green]Start x", default="0"))
+        stop = options["stop"] if options["stop"] is not None else float(Prompt.ask("[green]End x", default="10"))
+        initial = options["initial"]
+        if initial is None:
+            names = ", ".join("y" + "'" * k for k in range(system.order))
+            initial = odesolve.parse_values(Prompt.ask(f"[green]Initial values at x={start:g} ({names})"))
+        try:
+            grid, states, method, evaluations = system.integrate(start, stop, initial, options["method"], options["points"])
+        except KeyboardInterrupt:
+            console.print("Integration cancelled.", style="bold yellow")
+            return
+
+        state = ", ".join(f"{symbol} = y" + "'" * k for k, symbol in enumerate(system.state))
+        summary = Text(pretty(Eq(system.highest, system.rhs)) + "\n\n", style="bold cyan")
+        summary.append(f"State: {state} | Method: {method}, {evaluations} evaluations, "
+                       f"{len(grid)} points on [{start:g}, {stop:g}]", style="dim")
+        console.print(Panel.fit(summary, title="[bold magenta]Numeric Solution[/bold magenta]", border_style="bright_blue"))
+        if options["out"]:
+            odesolve.write_csv(options["out"], grid, states)
+            console.print(f"Wrote {len(grid)} rows to {options['out']}", style="bold green", markup=False)
+        else:
+            table = Table(show_header=True, header_style="bold magenta")
+            table.add_column("x", justify="right")
+            for k in range(len(states)):
+                table.add_column("y" + "'" * k, justify="right")
+            # a readable sample of the grid; the CSV output has every point
+            for i in sorted(set(np.linspace(0, len(grid) - 1, min(len(grid), TABLE_ROWS)).round().astype(int))):
+                table.add_row(f"{grid[i]:.6g}", *(f"{row[i]:.10g}" for row in states))
+            console.print(table)
+        if options["plot"]:
+            try:
+                odesolve.plot(grid, states, str(equation))
+            except ImportError:
+                console.print("Plotting needs matplotlib (pip install matplotlib).", style="bold red")
@@ -0,0 +1,188 @@
+# Parallel file/tree copy engine
+
+import errno, os, shutil, sys, threading
+from concurrent.futures import ThreadPoolExecutor
+from rich.console import Console
+from rich.progress import Progress, SpinnerColumn, TextColumn, DownloadColumn, TransferSpeedColumn, TimeElapsedColumn
+from shared import DEFAULT_WORKERS
+
+console = Console()
+CHUNK = 8 * 1024 * 1024
+PROGRESS_HZ = 8
+
+# errors meaning "this kernel/filesystem can't do zero-copy here", not "the copy failed"
+FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF}
+
+def zero_copy(infd, outfd, on_progress):
+    """Copies with copy_file_range, then sendfile; returns bytes copied or None if unsupported."""
+    copied = 0
+    if hasattr(os, "copy_file_range"):
+        try:
+            while True:
+                n = os.copy_file_range(infd, outfd, CHUNK)
+                if n == 0:
+                    return copied
+                copied += n
+                on_progress(n)
+        except OSError as e:
+            if copied or e.errno not in FALLBACK_ERRNOS:
+                raise
+    if hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+        try:
+            while True:
+                n = os.sendfile(outfd, infd, copied, CHUNK)
+                if n == 0:
+                    return copied
+                copied += n
+                on_progress(n)
+        except OSError as e:
+            if copied or e.errno not in FALLBACK_ERRNOS:
+                raise
+    return None
+
+def copy_file(src, dst, on_progress=lambda n: None):
+    """Copies one file's data and permission bits, in kernel space where possible."""
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"'{src}' and '{dst}' are the same file")
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        copied = zero_copy(fsrc.fileno(), fdst.fileno(), on_progress)
+        if copied is None:
+            buffer = bytearray(1024 * 1024)
+            view = memoryview(buffer)
+            while True:
+                n = fsrc.readinto(buffer)
+                if not n:
+                    break
+                fdst.write(view[:n])
+                on_progress(n)
+    shutil.copymode(src, dst)
+
+class CopyJob:
+    """Copies a file or a directory tree on a thread pool with a fixed-rate progress display."""
+
+    def __init__(self, workers=DEFAULT_WORKERS, show_progress=True):
+        self.workers = max(1, workers)
+        self.show_progress = show_progress and console.is_terminal
+        self.errors = []
+        self.files = 0
+        self.bytes = 0
+        self.lock = threading.Lock()
+        # bounds queued work so huge trees don't pile up millions of futures
+        self.slots = threading.BoundedSemaphore(self.workers * 4)
+
+    def run(self, src, dst):
+        with Progress(SpinnerColumn(), TextColumn("[cyan]{task.description}"), DownloadColumn(),
+                      TransferSpeedColumn(), TimeElapsedColumn(), console=console,
+                      refresh_per_second=PROGRESS_HZ, transient=True,
+                      disable=not self.show_progress) as progress:
+            self.progress = progress
+            self.task = progress.add_task("copying", total=None)
+            folders = []
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="copy") as pool:
+                if os.path.isdir(src) and not os.path.islink(src):
+                    folders = self.walk(pool, src, dst)
+                else:
+                    self.submit(pool, src, dst)
+            # like copytree: directory times and modes go on only after their contents are
+            # written (a read-only source dir would otherwise block its own files), deepest first
+            for folder, target in reversed(folders):
+                try:
+                    shutil.copystat(folder, target)
+                except OSError as e:
+                    self.errors.append((folder, e))
+        return self
+
+    def advance(self, n):
+        with self.lock:
+            self.bytes += n
+        self.progress.update(self.task, advance=n)
+
+    def submit(self, pool, src, dst):
+        self.slots.acquire()
+        future = pool.submit(self.copy_one, src, dst)
+        future.add_done_callback(lambda f: self.slots.release())
+
+    def copy_one(self, src, dst):
+        try:
+            copy_file(src, dst, self.advance)
+            with self.lock:
+                self.files += 1
+                self.progress.update(self.task, description=f"copying ({self.files} files)")
+        except OSError as e:
+            with self.lock:
+                self.errors.append((src, e))
+
+    def walk(self, pool, src, dst):
+        """Creates directories depth-first on this thread and hands files to the pool.
+
+        Returns the (source, target) directory pairs in creation order, so parents
+        come before their children.
+        """
+        stack = [(src, dst)]
+        folders = []
+        while stack:
+            folder, target = stack.pop()
+            try:
+                os.makedirs(target, exist_ok=True)
+                it = os.scandir(folder)
+            except OSError as e:
+                self.errors.append((folder, e))
+                continue
+            folders.append((folder, target))
+            with it:
+                for entry in it:
+                    out = os.path.join(target, entry.name)
+                    try:
+                        if entry.is_symlink():
+                            # replaced like an overwritten file; a real directory in the way is an error
+                            if os.path.lexists(out) and (os.path.islink(out) or not os.path.isdir(out)):
+                                os.remove(out)
+                            os.symlink(os.readlink(entry.path), out)
+                        elif entry.is_dir():
+                            stack.append((entry.path, out))
+                        else:
+                            self.submit(pool, entry.path, out)
+                    except OSError as e:
+                        with self.lock:
+                            self.errors.append((entry.path, e))
+        return folders
+
+def destination(src, dest):
+    """`copy a dir/` and `move a dir/` put `a` inside an existing directory, like cp/mv."""
+    if os.path.isdir(dest):
+        return os.path.join(dest, os.path.basename(os.path.normpath(src)))
+    return dest
+
+def check_target(src, target):
+    """Refuses copies that would truncate the source or recurse into their own output."""
+    if os.path.exists(target) and os.path.samefile(src, target):
+        raise shutil.SameFileError(f"'{src}' and '{target}' are the same file")
+    if os.path.isdir(src) and not os.path.islink(src):
+        source, inside = os.path.realpath(src), os.path.realpath(target)
+        if os.path.commonpath([source, inside]) == source:
+            raise ValueError(f"cannot copy '{src}' into itself ('{target}')")
+
+def copy(src, dest, recursive=False, workers=DEFAULT_WORKERS):
+    if os.path.isdir(src) and not recursive:
+        raise IsADirectoryError(f"'{src}' is a directory (use copy -r)")
+    target = destination(src, dest)
+    check_target(src, target)
+    return CopyJob(workers).run(src, target)
+
+def move(src, dest, workers=DEFAULT_WORKERS):
+    """Renames when possible; across filesystems copies in parallel, then removes the source."""
+    target = destination(src, dest)
+    try:
+        os.rename(src, target)
+        return None
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    check_target(src, target)
+    job = CopyJob(workers).run(src, target)
+    if not job.errors:
+        if os.path.isdir(src) and not os.path.islink(src):
+            shutil.rmtree(src)
+        else:
+            os.remove(src)
+    return job
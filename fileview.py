@@ -0,0 +1,122 @@
+# Streaming file viewer (cat/head/tail)
+
+import mmap, os, sys, time
+
+CHUNK = 1024 * 1024
+TAIL_BLOCK = 64 * 1024
+FOLLOW_INTERVAL = 0.25
+
+def output():
+    return sys.stdout.buffer
+
+def cat(path, out=None):
+    """Streams a file in fixed-size chunks; memory use does not depend on the file size."""
+    out = out or output()
+    buffer = bytearray(CHUNK)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            out.write(view[:n])
+    out.flush()
+
+def head(path, lines=10, out=None):
+    """Writes the first `lines` lines, locating them in the mmap instead of reading the file."""
+    out = out or output()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0 or lines <= 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = -1
+            for _ in range(lines):
+                end = mm.find(b"\n", end + 1)
+                if end == -1:
+                    end = size - 1
+                    break
+            pos = 0
+            # copy out in chunks so a huge first "line" is never materialised at once
+            while pos <= end:
+                out.write(mm[pos:min(pos + CHUNK, end + 1)])
+                pos += CHUNK
+    out.flush()
+
+def tail_offset(f, lines):
+    """Offset where the last `lines` lines start, found by reading backwards in blocks."""
+    size = f.seek(0, os.SEEK_END)
+    if lines <= 0:
+        return size
+    pos = size
+    wanted = lines
+    # a trailing newline ends the last line rather than starting an empty one
+    f.seek(size - 1 if size else 0)
+    if size and f.read(1) == b"\n":
+        wanted += 1
+    while pos > 0:
+        step = min(TAIL_BLOCK, pos)
+        pos -= step
+        f.seek(pos)
+        block = f.read(step)
+        count = block.count(b"\n")
+        if count >= wanted:
+            index = len(block)
+            for _ in range(wanted):
+                index = block.rfind(b"\n", 0, index)
+            return pos + index + 1
+        wanted -= count
+    return 0
+
+def copy_range(f, start, out, end=None):
+    """Writes f[start:end] in chunks; returns the offset reached."""
+    f.seek(start)
+    pos = start
+    while end is None or pos < end:
+        data = f.read(CHUNK if end is None else min(CHUNK, end - pos))
+        if not data:
+            break
+        out.write(data)
+        pos += len(data)
+    out.flush()
+    return pos
+
+def tail(path, lines=10, out=None):
+    out = out or output()
+    with open(path, "rb") as f:
+        copy_range(f, tail_offset(f, lines), out)
+
+def follow(path, lines=10, out=None, interval=FOLLOW_INTERVAL, notice=lambda message: None):
+    """tail -f: prints the last lines, then new data as it is appended until interrupted.
+
+    The file is polled with fstat; a new inode at `path` (log rotation) or a
+    shrinking file (truncation) makes it restart from the top of the new file.
+    """
+    out = out or output()
+    f = open(path, "rb")
+    try:
+        pos = copy_range(f, tail_offset(f, lines), out)
+        while True:
+            size = os.fstat(f.fileno()).st_size
+            if size < pos:
+                notice(f"{path}: file truncated")
+                pos = 0
+            if size > pos:
+                pos = copy_range(f, pos, out)
+                continue
+            try:
+                current = os.stat(path)
+            except FileNotFoundError:
+                current = None
+            opened = os.fstat(f.fileno())
+            if current and (current.st_ino, current.st_dev) != (opened.st_ino, opened.st_dev):
+                # drain what was written to the old file before switching
+                copy_range(f, pos, out)
+                notice(f"{path}: file replaced, following new file")
+                f.close()
+                f = open(path, "rb")
+                pos = 0
+                continue
+            time.sleep(interval)
+    finally:
+        f.close()
@@ -3,6 +3,7 @@ import subprocess
 from InquirerPy import inquirer
 
 class Game:
+    @staticmethod
     def play_game(args=None):
         games_dir = "game"
         games = [f for f in os.listdir(games_dir) if os.path.isdir(os.path.join(games_dir, f))]
@@ -4,6 +4,7 @@ import speech_recognition as sr
 from rich.console import Console
 from flask import Flask, render_template_string
 import time, webbrowser
+from segments import segments
 
 console = Console()
 
@@ -12,6 +13,7 @@ class Git:
         """Runs a Git command and provides syntax if incorrect."""
         try:
             result = subprocess.run(command, shell=True, text=True, capture_output=True)
+            segments.invalidate_git()
 
             if result.returncode != 0:
                 console.print(f"Error: {result.stderr.strip()}", style="bold red")
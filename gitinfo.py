@@ -0,0 +1,103 @@
+# Git repository locator and HEAD reader (no subprocesses)
+
+import os
+from functools import lru_cache
+
+@lru_cache(maxsize=256)
+def find_repo(path):
+    """Returns (worktree_root, git_dir, common_dir) for `path`, or None outside a repo.
+
+    Handles `.git` files with a `gitdir:` pointer (worktrees and submodules)
+    and the `commondir` file a linked worktree uses to reach shared refs.
+    Results are cached per directory; call find_repo.cache_clear() after
+    creating or removing a repository.
+    """
+    path = os.path.abspath(path)
+    while True:
+        dot_git = os.path.join(path, ".git")
+        if os.path.isdir(dot_git):
+            return path, dot_git, common_dir(dot_git)
+        if os.path.isfile(dot_git):
+            git_dir = read_gitdir_file(dot_git)
+            if git_dir:
+                return path, git_dir, common_dir(git_dir)
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+def read_gitdir_file(dot_git):
+    try:
+        with open(dot_git, "r") as f:
+            line = f.readline().strip()
+    except OSError:
+        return None
+    if not line.startswith("gitdir:"):
+        return None
+    git_dir = line[len("gitdir:"):].strip()
+    if not os.path.isabs(git_dir):
+        git_dir = os.path.join(os.path.dirname(dot_git), git_dir)
+    git_dir = os.path.normpath(git_dir)
+    return git_dir if os.path.isdir(git_dir) else None
+
+def common_dir(git_dir):
+    try:
+        with open(os.path.join(git_dir, "commondir"), "r") as f:
+            shared = f.read().strip()
+    except OSError:
+        return git_dir
+    if not os.path.isabs(shared):
+        shared = os.path.join(git_dir, shared)
+    return os.path.normpath(shared)
+
+def read_ref_file(path):
+    try:
+        with open(path, "r") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def resolve_ref(git_dir, shared_dir, ref, depth=0):
+    """Follows a (possibly symbolic) ref to a commit id, checking loose refs then packed-refs."""
+    if depth > 5:
+        return None
+    # HEAD and other per-worktree refs live in git_dir, branches in the common dir
+    for base in (git_dir, shared_dir):
+        value = read_ref_file(os.path.join(base, ref))
+        if value:
+            if value.startswith("ref:"):
+                return resolve_ref(git_dir, shared_dir, value[4:].strip(), depth + 1)
+            return value
+    try:
+        with open(os.path.join(shared_dir, "packed-refs"), "r") as f:
+            for line in f:
+                if line.startswith(("#", "^")):
+                    continue
+                parts = line.split()
+                if len(parts) == 2 and parts[1] == ref:
+                    return parts[0]
+    except OSError:
+        pass
+    return None
+
+def read_head(path="."):
+    """Returns the current branch name, a short commit id for a detached HEAD, or None."""
+    repo = find_repo(os.path.abspath(path))
+    if not repo:
+        return None
+    _, git_dir, shared_dir = repo
+    head = read_ref_file(os.path.join(git_dir, "HEAD"))
+    if not head:
+        return None
+    if head.startswith("ref:"):
+        ref = head[4:].strip()
+        return ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else ref
+    return head[:7]
+
+def head_commit(path="."):
+    """Returns the full commit id HEAD points at, or None for an unborn branch."""
+    repo = find_repo(os.path.abspath(path))
+    if not repo:
+        return None
+    _, git_dir, shared_dir = repo
+    return resolve_ref(git_dir, shared_dir, "HEAD")
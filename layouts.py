@@ -0,0 +1,309 @@
+# Terminal Layout Templates
+
+import json, os, string
+from datetime import datetime
+from rich.cells import cell_len
+from rich.console import Console
+from rich.text import Text
+from settings import config_dir
+
+# A layout is data: "left" and "right" lists of parts drawn on one line, the
+# gap between them padded to the console width when "fill" is set. A part is
+# [text, style] where text may contain {field} / {field:format} placeholders,
+# {"when": field, "parts": [...]} drawn only if the field is truthy, or
+# {"each": field, "parts": [...]} repeated for every item of a list field
+# (the item is available as {part}).
+#
+# Fields: time, folder, cwd_tail, cwd_tail_arrow, cwd_parts, branch,
+# raw_branch, changes, mem_percent, mem_used_gb, mem_total_gb, mem_used_gib,
+# mem_total_gib, hostname, short_host, user, exec_ms.
+LAYOUTS = {
+    1: {
+        "name": "Solarized Night",
+        "left": [
+            ["\n ☾ ", "white on dark_blue"],
+            ["Solar Night", "bright_white on dark_blue"],
+            ["  {time:%H:%M} ", "white on dark_blue"],
+            [" | 📁 {cwd_tail} ", "cyan"],
+        ],
+        "right": [
+            ["", "black on blue"],
+            ["   {branch} ", "black on blue"],
+        ],
+        "fill": True,
+    },
+    2: {
+        "name": "Hacker Green",
+        "left": [
+            ["\nHacker Mode", "white on green"],
+            [" | ⏰ {time:%H:%M} | MEM: {mem_percent}% ", "white on green"],
+            [" | 📁 {cwd_tail} ", "bright_green"],
+        ],
+        "right": [
+            ["", "black on green"],
+            ["   {branch} ", "black on green"],
+        ],
+        "fill": True,
+    },
+    3: {
+        "name": "Agnoster",
+        "left": [
+            ["\n", "green"],
+            ["", "black"],
+            [" {hostname} ", "black on white"],
+            ["", "white on black"],
+            {"each": "cwd_parts", "parts": [
+                ["", "black on blue"],
+                [" {part} ", "white on blue"],
+                ["", "blue on black"],
+            ]},
+        ],
+        "right": [
+            ["", "black on green"],
+            ["  {branch} ", "black on green"],
+            ["", "green on black"],
+        ],
+    },
+    4: {
+        "name": "Marcduiker",
+        "left": [
+            ["\n", "black on #FFD700"],
+            [" {folder} ", "black on #FFD700"],
+            ["", "#FFD700 on dark_orange"],
+            ["  {branch} = ", "black on dark_orange"],
+            [" {changes} ", "black on dark_orange"],
+            ["", "dark_orange on blue"],
+            [" {time:%H:%M} ", "white on blue"],
+            ["", "blue on black"],
+        ],
+    },
+    5: {
+        "name": "Clean Detailed",
+        "left": [
+            ["\n", "white on #DCDCDC"],
+            ["  shell ", "black on #DCDCDC"],
+            ["", "#DCDCDC on black"],
+            ["", "black on #4682B4"],
+            [" MEM: {mem_percent:.2f}% ", "white on #4682B4"],
+            [" {mem_used_gib}/{mem_total_gib}GB ", "white on #4682B4"],
+            ["", "#4682B4 on grey30"],
+            [" {exec_ms}ms ", "white on grey30"],
+            ["", "grey30 on black"],
+            [" → {folder} ", "white on black"],
+        ],
+        "right": [
+            ["", "bright_cyan on black"],
+            ["  {branch} = ", "black on bright_cyan"],
+            [" {changes} ", "black on bright_cyan"],
+        ],
+        "fill": True,
+    },
+    6: {
+        "name": "Atomic-Lite",
+        "left": [
+            ["\n", "black on blue"],
+            [" shell ", "white on blue"],
+            ["", "blue on black"],
+            ["", "black on dark_orange"],
+            ["  ", "black on dark_orange"],
+            ["{folder} ", "black on dark_orange"],
+            ["", "dark_orange on black"],
+            ["", "black on yellow"],
+            [" {branch} =  {changes} ", "black on yellow"],
+            ["", "yellow on black"],
+            ["", "black on grey70"],
+            [" {exec_ms}ms ", "black on grey70"],
+            ["", "grey70 on black"],
+        ],
+        "right": [
+            ["", "green on black"],
+            [" 󰾆  {mem_percent:.1f}% ", "green on black"],
+            ["", "blue on black"],
+            [" {short_host} ", "white on blue"],
+            ["", "black on blue"],
+            ["", "grey70 on black"],
+            ["  {time:%a, %H:%M} ", "black on grey70"],
+        ],
+        "fill": True,
+    },
+    7: {
+        "name": "PyShell Default",
+        "left": [
+            ["\n # ", "black on white"],
+            [" shell ", "white on blue"],
+            ["", "blue on black"],
+            ["", "black on blue"],
+            [" MEM: {mem_percent}% ↑ {mem_used_gb:.0f}/{mem_total_gb:.0f}GB ", "white on blue"],
+            ["", "blue on grey15"],
+            [" code ", "white on grey15"],
+            ["", "grey15 on black"],
+            [" {time:%H:%M} ", "white on black"],
+            ["", "black"],
+            {"each": "cwd_parts", "parts": [
+                [" // ", "white"],
+                ["📁", "white"],
+                [" {part} ", "white"],
+            ]},
+        ],
+        "right": [
+            ["", "black on medium_sea_green"],
+            ["   ", "black on medium_sea_green"],
+            [" {branch} ≡ ⎔ ~1 ", "black on medium_sea_green"],
+        ],
+        "fill": True,
+    },
+    8: {
+        "name": "Softline",
+        "left": [
+            ["\n", "grey37"],
+            [" shell ", "black on grey37"],
+            ["", "grey37"],
+            ["", "grey85"],
+            ["  {user}@{short_host} ", "black on grey85"],
+            ["", "grey85"],
+            {"when": "raw_branch", "parts": [
+                ["", "khaki1"],
+                ["  {raw_branch} ", "black on khaki1"],
+                ["", "khaki1"],
+            ]},
+            ["\n[   {cwd_tail_arrow} ]", "white"],
+        ],
+        "right": [
+            ["{exec_ms}ms  -  {time:%d/%m/%y %H:%M}", "bold palegreen3"],
+        ],
+        "fill": True,
+    },
+}
+
+formatter = string.Formatter()
+
+class TextPart:
+    """A [text, style] part; static text is built once, dynamic text only when its fields change."""
+
+    def __init__(self, template, style):
+        self.template = template
+        self.style = style
+        self.fields = {name for _, name, _, _ in formatter.parse(template) if name}
+        self.static = None if self.fields else Text(template, style=style)
+        self.last_key = None
+        self.last_text = None
+
+    def render(self, values):
+        if self.static is not None:
+            return self.static
+        key = tuple(values[name] for name in sorted(self.fields))
+        if key != self.last_key:
+            self.last_key = key
+            self.last_text = Text(self.template.format_map(values), style=self.style)
+        return self.last_text
+
+class GroupPart:
+    """A `when` or `each` part wrapping nested parts."""
+
+    def __init__(self, kind, field, parts):
+        self.kind = kind
+        self.field = field
+        self.parts = compile_parts(parts)
+        self.fields = {field}.union(*(part.fields for part in self.parts)) - {"part"}
+        self.last_key = None
+        self.last_text = None
+
+    def render(self, values):
+        key = tuple(values[name] for name in sorted(self.fields))
+        if key == self.last_key:
+            return self.last_text
+        self.last_key = key
+        self.last_text = text = Text()
+        if self.kind == "when":
+            if values[self.field]:
+                for part in self.parts:
+                    text.append_text(part.render(values))
+            return text
+        for item in values[self.field]:
+            scoped = type(values)(values)
+            scoped["part"] = item
+            for part in self.parts:
+                text.append_text(part.render(scoped))
+        return text
+
+def compile_parts(parts):
+    compiled = []
+    for part in parts:
+        if isinstance(part, dict):
+            kind = "each" if "each" in part else "when"
+            compiled.append(GroupPart(kind, part[kind], part["parts"]))
+        else:
+            compiled.append(TextPart(*part))
+    return compiled
+
+class LayoutPlan:
+    """A layout template compiled once for a given console width."""
+
+    def __init__(self, template, width):
+        self.name = template.get("name", "")
+        self.width = width
+        self.left = compile_parts(template.get("left", []))
+        self.right = compile_parts(template.get("right", []))
+        self.fill = template.get("fill", False)
+        self.fields = set().union(*(part.fields for part in self.left + self.right))
+        self.last_values = None
+        self.last_prompt = None
+
+    def render(self, values):
+        """Fills in the dynamic fields; returns the previous Text untouched if nothing changed."""
+        if values == self.last_values:
+            return self.last_prompt
+        left = Text()
+        for part in self.left:
+            left.append_text(part.render(values))
+        right = Text()
+        for part in self.right:
+            right.append_text(part.render(values))
+        if self.fill:
+            last_line = left.plain.split("\n")[-1]
+            left.append(" " * max(self.width - cell_len(last_line) - right.cell_len, 1))
+        left.append_text(right)
+        self.last_values = values
+        self.last_prompt = left
+        return left
+
+class SampleValues(dict):
+    def __missing__(self, key):
+        return ""
+
+# one value of the right type per field, for a trial render of user layouts
+SAMPLE_VALUES = {
+    "time": datetime(2000, 1, 1, 12, 0), "folder": "pyshell", "cwd_tail": "src/pyshell",
+    "cwd_tail_arrow": "src » pyshell", "cwd_parts": ("src", "pyshell"), "branch": "main", "raw_branch": "main",
+    "changes": 0, "mem_percent": 50.0, "mem_used_gb": 4.0, "mem_total_gb": 8.0, "mem_used_gib": 4,
+    "mem_total_gib": 8, "hostname": "host.local", "short_host": "host", "user": "user", "exec_ms": 0,
+}
+
+def check_layout(template):
+    """Compiles a template and renders it once with sample values; raises if it is malformed."""
+    if not isinstance(template, dict):
+        raise ValueError("a layout must be an object with left/right parts")
+    LayoutPlan(template, 80).render(SampleValues(SAMPLE_VALUES))
+
+def load_user_layouts(path=None):
+    """Adds layouts from layouts.json ({"9": {"name": ..., "left": [...], ...}}) to LAYOUTS.
+
+    Each layout is checked when it is loaded; a broken one is skipped with a
+    warning instead of failing at every prompt.
+    """
+    path = path or os.path.join(config_dir(), "layouts.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            user_layouts = json.load(f)
+    except (OSError, ValueError):
+        return
+    for key, template in user_layouts.items():
+        try:
+            check_layout(template)
+        except (ValueError, TypeError, KeyError, IndexError, AttributeError) as e:
+            Console().print(f"layouts.json: skipping layout {key}: {type(e).__name__}: {e}", style="bold yellow", markup=False)
+            continue
+        register_layout(int(key) if str(key).isdigit() else key, template)
+
+def register_layout(key, template):
+    LAYOUTS[key] = template
@@ -2,18 +2,156 @@
 
 from rich.console import Console
 from rich.prompt import Prompt
-import os, psutil, shutil, math, threading, socket, requests
-from sympy import symbols, sympify, diff, integrate, pretty
+from rich.table import Table
+from rich.tree import Tree
+from rich.markup import escape
+import os, psutil, threading, socket, stat, time
+import fastcopy, search, diskusage, fileview, editor, checksums, mathexpr
+from segments import segments
+from settings import settings
+from shared import format_size
+from concurrent.futures import Future, TimeoutError as FutureTimeout
 
 console = Console()
 lock = threading.Lock()
+OUTPUT_CHUNK = 512
+# requests' timeout does not cover DNS resolution, so the shell stops waiting this long after it
+LOOKUP_MARGIN = 1.0
+
+class LineBuffer:
+    """Collects output lines and prints them in chunks instead of one console.print per line.
+
+    A chunk is also flushed after `interval` seconds so slow producers still stream.
+    """
+
+    def __init__(self, chunk=OUTPUT_CHUNK, interval=0.1):
+        self.chunk = chunk
+        self.interval = interval
+        self.lines = []
+        self.last_flush = time.monotonic()
+
+    def add(self, line):
+        self.lines.append(line)
+        if len(self.lines) >= self.chunk or time.monotonic() - self.last_flush >= self.interval:
+            self.flush()
+
+    def flush(self):
+        if self.lines:
+            console.print("\n".join(self.lines), markup=False, highlight=False, soft_wrap=True)
+            self.lines = []
+        self.last_flush = time.monotonic()
+
+def external_ip(url, timeout):
+    """Asks an echo-IP endpoint (configurable, so an offline stub can stand in) for our public address."""
+    import requests
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.text.strip()
+
+def existing_paths(command, paths):
+    """Reports paths that do not exist (like cat does) and returns the rest."""
+    found = []
+    for path in paths:
+        if os.path.lexists(path):
+            found.append(path)
+        else:
+            console.print(f"{command}: {path}: No such file or directory", style="bold red", markup=False)
+    return found
+
+def parse_ls_args(args):
+    options = {"long": False, "all": False, "recursive": False, "sort": None, "limit": None, "paths": []}
+    args = list(args)
+    while args:
+        arg = args.pop(0)
+        if arg == "--limit" and args:
+            options["limit"] = int(args.pop(0))
+        elif arg.startswith("--limit="):
+            options["limit"] = int(arg.split("=", 1)[1])
+        elif arg in ("-all", "--all"):
+            options["all"] = True
+        elif arg.startswith("-") and len(arg) > 1:
+            for flag in arg[1:]:
+                if flag == "l":
+                    options["long"] = True
+                elif flag == "a":
+                    options["all"] = True
+                elif flag == "R":
+                    options["recursive"] = True
+                elif flag == "S":
+                    options["sort"] = "size"
+                elif flag == "t":
+                    options["sort"] = "mtime"
+                else:
+                    raise ValueError(f"unknown option -{flag}")
+        else:
+            options["paths"].append(arg)
+    return options
 
 class Commands:
     # Commands
-    def list_files(self, ):
+    def list_files(self, args=()):
+        """ls [-l] [-a] [-R] [-S|-t] [--limit N] [path ...] built on os.scandir."""
+        try:
+            options = parse_ls_args(args)
+        except ValueError as e:
+            console.print(f"ls: {e}", style="bold red")
+            console.print("Usage: ls [-l] [-a] [-R] [-S|-t] [--limit N] [path ...]", style="bold yellow", markup=False)
+            return
+
         console.print("\nFiles and Directories:", style="bold cyan")
-        for item in os.listdir():
-            console.print(f" - {item}")
+        out = LineBuffer()
+        remaining = [options["limit"]]
+        try:
+            for path in options["paths"] or ["."]:
+                # depth-first walk; only directory paths wait on the stack, never entries
+                stack = [path]
+                while stack:
+                    folder = stack.pop()
+                    if options["recursive"] or len(options["paths"]) > 1:
+                        out.add(f"\n{folder}:")
+                    subdirs = self.list_directory(folder, options, out, remaining)
+                    if remaining[0] == 0:
+                        return
+                    if options["recursive"]:
+                        stack.extend(reversed(subdirs))
+        finally:
+            out.flush()
+
+    def list_directory(self, folder, options, out, remaining):
+        """Prints one directory's entries; returns its subdirectories for -R."""
+        subdirs = []
+        try:
+            with os.scandir(folder) as it:
+                entries = (e for e in it if options["all"] or not e.name.startswith("."))
+                if options["sort"]:
+                    key = "st_size" if options["sort"] == "size" else "st_mtime"
+                    entries = sorted(entries, key=lambda e: getattr(self.entry_stat(e), key, 0), reverse=True)
+                for entry in entries:
+                    if remaining[0] is not None:
+                        if remaining[0] == 0:
+                            break
+                        remaining[0] -= 1
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if options["long"]:
+                        info = self.entry_stat(entry)
+                        if info:
+                            modified = time.strftime("%Y-%m-%d %H:%M", time.localtime(info.st_mtime))
+                            out.add(f"{stat.filemode(info.st_mode)} {format_size(info.st_size):>7} {modified} {entry.name}")
+                        else:
+                            out.add(f"?????????? {'?':>7} {'?':>16} {entry.name}")
+                    else:
+                        out.add(f" - {entry.name}{os.sep if is_dir else ''}")
+                    if is_dir and options["recursive"]:
+                        subdirs.append(entry.path)
+        except OSError as e:
+            out.add(f"ls: {folder}: {e.strerror}")
+        return subdirs
+
+    def entry_stat(self, entry):
+        try:
+            return entry.stat(follow_symlinks=False)
+        except OSError:
+            return None
 
     def create_file(self, filename):
         with open(filename, 'w') as f:
@@ -33,14 +171,259 @@ class Commands:
         console.print(f" CPU Usage: {psutil.cpu_percent()}%")
         console.print(f" RAM Usage: {psutil.virtual_memory().percent}%")
         
-    def network_info(self, *args):
+    def du_options(self, args, depth):
+        options = {"path": ".", "depth": depth, "top": 20, "rescan": False, "workers": diskusage.DEFAULT_WORKERS}
+        args = list(args)
+        while args:
+            arg = args.pop(0)
+            if arg in ("-d", "--depth"):
+                options["depth"] = int(args.pop(0))
+            elif arg == "--top":
+                options["top"] = int(args.pop(0))
+            elif arg == "-j":
+                options["workers"] = int(args.pop(0))
+            elif arg == "--rescan":
+                options["rescan"] = True
+            elif arg.startswith("-"):
+                raise ValueError(f"unknown option {arg}")
+            else:
+                options["path"] = arg
+        return options
+
+    def measure_sizes(self, options):
+        start = time.perf_counter()
+        index = diskusage.SizeIndex()
         try:
-            local_ip = socket.gethostbyname(socket.gethostname())
-            external_ip = requests.get("https://api64.ipify.org").text
-            console.print(f"Local IP: {local_ip}")
-            console.print(f"External IP: {external_ip}")
-        except Exception as e:
-            console.print(f"Network Error: {e}", style="bold red")
+            totals = index.measure(options["path"], options["workers"], options["rescan"])
+        finally:
+            index.close()
+        elapsed = time.perf_counter() - start
+        console.print(f"{index.scanned} directories scanned, {index.reused} reused from index in {elapsed:.2f}s", style="dim")
+        return totals
+
+    def disk_usage(self, args):
+        """du [path] [-d N] [--top N] [--rescan] [-j N]: largest directories, using the size index."""
+        try:
+            options = self.du_options(args, depth=1)
+        except (ValueError, IndexError) as e:
+            console.print(f"du: {e or 'missing argument'}", style="bold red")
+            console.print("Usage: du [path] [-d N] [--top N] [--rescan] [-j N]", style="bold yellow", markup=False)
+            return
+        if not os.path.isdir(options["path"]):
+            console.print(f"du: {options['path']}: not a directory", style="bold red")
+            return
+        totals = self.measure_sizes(options)
+        root = os.path.abspath(options["path"])
+
+        rows = []
+        stack = [(root, 0)]
+        while stack:
+            path, depth = stack.pop()
+            if 0 < depth <= options["depth"]:
+                rows.append((totals[path][0], totals[path][1], path))
+            if depth < options["depth"]:
+                stack.extend((child, depth + 1) for child in totals[path][2])
+        rows.sort(reverse=True)
+
+        table = Table(title=f"Disk usage: {root}", style="cyan")
+        table.add_column("Size", justify="right", style="bold green")
+        table.add_column("Files", justify="right")
+        table.add_column("Directory", style="bold yellow")
+        for size, files, path in rows[:options["top"]]:
+            table.add_row(format_size(size), str(files), os.path.relpath(path, root))
+        table.add_row(format_size(totals[root][0]), str(totals[root][1]), "[bold](total)[/bold]")
+        console.print(table)
+
+    def tree(self, args):
+        """tree [path] [-d N] [--top N] [--rescan]: directory tree annotated with sizes."""
+        try:
+            options = self.du_options(args, depth=2)
+        except (ValueError, IndexError) as e:
+            console.print(f"tree: {e or 'missing argument'}", style="bold red")
+            console.print("Usage: tree [path] [-d N] [--top N] [--rescan] [-j N]", style="bold yellow", markup=False)
+            return
+        if not os.path.isdir(options["path"]):
+            console.print(f"tree: {options['path']}: not a directory", style="bold red")
+            return
+        totals = self.measure_sizes(options)
+        root = os.path.abspath(options["path"])
+
+        def label(path, name):
+            size, files, _ = totals[path]
+            return f"[bold green]{format_size(size):>8}[/bold green]  [bold yellow]{escape(name)}[/bold yellow] [dim]({files} files)[/dim]"
+
+        view = Tree(label(root, root))
+        stack = [(root, view, 0)]
+        while stack:
+            path, node, depth = stack.pop()
+            if depth >= options["depth"]:
+                continue
+            children = sorted(totals[path][2], key=lambda c: totals[c][0], reverse=True)
+            for child in children[:options["top"]]:
+                stack.append((child, node.add(label(child, os.path.basename(child))), depth + 1))
+            if len(children) > options["top"]:
+                node.add(f"[dim]... {len(children) - options['top']} more[/dim]")
+        console.print(view)
+
+    def checksum(self, args):
+        """checksum [-a md5|sha1|sha256|blake2] [-r] [-j N] FILE ...: digests computed in parallel and cached."""
+        usage = "Usage: checksum [-a md5|sha1|sha256|blake2] [-r] [-j N] FILE ..."
+        algorithm, recursive, workers, paths = "sha256", False, checksums.DEFAULT_WORKERS, []
+        args = list(args)
+        try:
+            while args:
+                arg = args.pop(0)
+                if arg == "-a":
+                    algorithm = args.pop(0).lower()
+                    if algorithm not in checksums.ALGORITHMS:
+                        raise ValueError(f"unknown algorithm {algorithm}")
+                elif arg == "-r":
+                    recursive = True
+                elif arg == "-j":
+                    workers = int(args.pop(0))
+                elif arg.startswith("-") and len(arg) > 1:
+                    raise ValueError(f"unknown option {arg}")
+                else:
+                    paths.append(arg)
+            if not paths:
+                raise ValueError("no file given")
+        except (ValueError, IndexError) as e:
+            console.print(f"checksum: {e or 'missing argument'}", style="bold red", markup=False)
+            console.print(usage, style="bold yellow", markup=False)
+            return
+        if recursive:
+            paths = list(search.walk_files(paths, workers))
+
+        cache = checksums.HashCache()
+        out = LineBuffer()
+        try:
+            for path, digest in checksums.checksums(paths, cache, algorithm, workers):
+                if isinstance(digest, OSError):
+                    out.add(f"checksum: {path}: {digest.strerror}")
+                else:
+                    out.add(f"{digest}  {path}")
+        except KeyboardInterrupt:
+            console.print("checksum: interrupted", style="bold yellow")
+        finally:
+            out.flush()
+            cache.close()
+
+    def dupes(self, args):
+        """dupes [path ...] [--min-size N[kMG]] [--all] [-j N]: groups of identical files."""
+        usage = "Usage: dupes [path ...] [--min-size N[kMG]] [--all] [-j N]"
+        roots, min_size, workers, skip = [], 1, checksums.DEFAULT_WORKERS, search.SKIP_DIRS
+        args = list(args)
+        try:
+            while args:
+                arg = args.pop(0)
+                if arg == "--min-size":
+                    min_size = max(1, search.parse_size(args.pop(0))[1])
+                elif arg == "-j":
+                    workers = int(args.pop(0))
+                elif arg == "--all":
+                    skip = set()
+                elif arg.startswith("-") and len(arg) > 1:
+                    raise ValueError(f"unknown option {arg}")
+                else:
+                    roots.append(arg)
+        except (ValueError, IndexError) as e:
+            console.print(f"dupes: {e or 'missing argument'}", style="bold red", markup=False)
+            console.print(usage, style="bold yellow", markup=False)
+            return
+
+        start = time.perf_counter()
+        cache = checksums.HashCache()
+        try:
+            groups = checksums.find_duplicates(search.walk_files(roots or ["."], workers, skip), cache, min_size, workers)
+        except KeyboardInterrupt:
+            console.print("dupes: interrupted", style="bold yellow")
+            return
+        finally:
+            cache.close()
+        out = LineBuffer()
+        wasted = 0
+        for size, paths in groups:
+            wasted += size * (len(paths) - 1)
+            out.add(f"\n{len(paths)} x {format_size(size)}:")
+            for path in sorted(paths):
+                out.add(f"  {path}")
+        out.flush()
+        elapsed = time.perf_counter() - start
+        console.print(f"\n{len(groups)} duplicate group(s), {format_size(wasted)} reclaimable", style="bold cyan")
+        console.print(f"{cache.hits} hash(es) from cache, {cache.misses} computed in {elapsed:.2f}s", style="dim")
+
+    def network_info(self, args=()):
+        """network [-e|--external] [-i SECONDS]: interfaces, addresses and throughput; works offline."""
+        external, interval = False, 1.0
+        args = list(args)
+        try:
+            while args:
+                arg = args.pop(0)
+                if arg in ("-e", "--external"):
+                    external = True
+                elif arg in ("-i", "--interval"):
+                    interval = float(args.pop(0))
+                else:
+                    raise ValueError(f"unknown option {arg}")
+        except (ValueError, IndexError) as e:
+            console.print(f"network: {e or 'missing argument'}", style="bold red", markup=False)
+            console.print("Usage: network [-e|--external] [-i SECONDS]", style="bold yellow", markup=False)
+            return
+
+        # the external lookup runs while the throughput sample is being taken
+        pending = None
+        if external:
+            pending = Future()
+            timeout = settings.get("external_ip_timeout")
+            deadline = time.monotonic() + timeout + LOOKUP_MARGIN
+
+            def lookup():
+                try:
+                    pending.set_result(external_ip(settings.get("external_ip_url"), timeout))
+                except Exception as e:
+                    pending.set_exception(e)
+            # a daemon thread, so a lookup stuck in name resolution never holds up the shell or its exit
+            threading.Thread(target=lookup, name="external-ip", daemon=True).start()
+        before = psutil.net_io_counters(pernic=True)
+        start = time.monotonic()
+        time.sleep(interval)
+        after = psutil.net_io_counters(pernic=True)
+        elapsed = time.monotonic() - start
+
+        addresses = psutil.net_if_addrs()
+        stats = psutil.net_if_stats()
+        table = Table(title=f"Network interfaces on {socket.gethostname()}", style="cyan")
+        table.add_column("Interface", style="bold yellow")
+        table.add_column("Status")
+        table.add_column("Addresses")
+        table.add_column("RX/s", justify="right", style="bold green")
+        table.add_column("TX/s", justify="right", style="bold green")
+        table.add_column("RX total", justify="right")
+        table.add_column("TX total", justify="right")
+        for name in sorted(addresses.keys() | after.keys()):
+            info = stats.get(name)
+            status = ("[green]up[/green]" if info.isup else "[red]down[/red]") if info else "?"
+            if info and info.speed:
+                status += f" {info.speed} Mb/s"
+            listed = [escape(a.address) for a in addresses.get(name, []) if a.family in (socket.AF_INET, socket.AF_INET6)]
+            listed += [f"[dim]{escape(a.address)}[/dim]" for a in addresses.get(name, []) if a.family == psutil.AF_LINK and a.address]
+            old, new = before.get(name), after.get(name)
+            if old and new:
+                rates = (format_size((new.bytes_recv - old.bytes_recv) / elapsed) + "/s",
+                         format_size((new.bytes_sent - old.bytes_sent) / elapsed) + "/s",
+                         format_size(new.bytes_recv), format_size(new.bytes_sent))
+            else:
+                rates = ("-", "-", "-", "-")
+            table.add_row(escape(name), status, "\n".join(listed) or "-", *rates)
+        console.print(table)
+
+        if pending:
+            try:
+                console.print(f"External IP: {pending.result(timeout=max(0, deadline - time.monotonic()))}", markup=False)
+            except FutureTimeout:
+                console.print(f"External IP unavailable: no answer within {timeout:g}s", style="bold yellow", markup=False)
+            except Exception as e:
+                console.print(f"External IP unavailable: {e}", style="bold yellow", markup=False)
 
     def create_folder(self, folder_name):
         os.makedirs(folder_name, exist_ok=True)
@@ -56,22 +439,86 @@ class Commands:
     def change_directory(self, path):
         try:
             os.chdir(path)
+            segments.invalidate_git()
             console.print(f"Changed directory to {os.getcwd()}", style="bold green")
         except Exception as e:
             console.print(str(e), style="bold red")
 
+    def cat(self, args):
+        """cat FILE [FILE ...]: streams files to the terminal in constant memory."""
+        if not args:
+            console.print("Usage: cat FILE [FILE ...]", style="bold yellow", markup=False)
+            return
+        for path in args:
+            try:
+                fileview.cat(path)
+            except IsADirectoryError:
+                console.print(f"cat: {path}: Is a directory", style="bold red", markup=False)
+            except OSError as e:
+                console.print(f"cat: {path}: {e.strerror}", style="bold red", markup=False)
+            except KeyboardInterrupt:
+                return
+
+    def view_options(self, args, follow=False):
+        """Parses [-n N | -N] [-f] FILE ... for head and tail."""
+        options = {"lines": 10, "follow": False, "paths": []}
+        args = list(args)
+        while args:
+            arg = args.pop(0)
+            if arg == "-n":
+                options["lines"] = int(args.pop(0))
+            elif arg == "-f" and follow:
+                options["follow"] = True
+            elif arg.startswith("-") and arg[1:].isdigit():
+                options["lines"] = int(arg[1:])
+            elif arg.startswith("-") and len(arg) > 1:
+                raise ValueError(f"unknown option {arg}")
+            else:
+                options["paths"].append(arg)
+        if not options["paths"]:
+            raise ValueError("no file given")
+        if options["follow"] and len(options["paths"]) > 1:
+            raise ValueError("-f follows a single file")
+        return options
+
+    def show_part(self, name, args, show, follow=False):
+        usage = f"Usage: {name} [-n N] {'[-f] ' if follow else ''}FILE [FILE ...]"
+        try:
+            options = self.view_options(args, follow)
+        except (ValueError, IndexError) as e:
+            console.print(f"{name}: {e or 'missing argument'}", style="bold red", markup=False)
+            console.print(usage, style="bold yellow", markup=False)
+            return
+        paths = options["paths"]
+        try:
+            for path in paths:
+                if len(paths) > 1:
+                    console.print(f"==> {path} <==", style="bold cyan", markup=False)
+                try:
+                    if options["follow"]:
+                        notice = lambda message: console.print(f"{name}: {message}", style="bold yellow", markup=False)
+                        fileview.follow(path, options["lines"], notice=notice)
+                    else:
+                        show(path, options["lines"])
+                except IsADirectoryError:
+                    console.print(f"{name}: {path}: Is a directory", style="bold red", markup=False)
+                except OSError as e:
+                    console.print(f"{name}: {path}: {e.strerror}", style="bold red", markup=False)
+        except KeyboardInterrupt:
+            console.print()
+
+    def head(self, args):
+        """head [-n N] FILE ...: first lines of each file."""
+        self.show_part("head", args, fileview.head)
+
+    def tail(self, args):
+        """tail [-n N] [-f] FILE ...: last lines, found by seeking backwards; -f keeps following."""
+        self.show_part("tail", args, fileview.tail, follow=True)
+
     def text_editor(self, filename):
-        if not os.path.exists(filename):
-            console.print("File not found. Creating a new file.", style="bold yellow")
-        with open(filename, 'a+') as f:
-            console.print("Enter text (type 'exit' to save and exit):", style="bold cyan")
-            while True:
-                line = input()
-                if line.lower() == 'exit':
-                    break
-                f.write(line + '\n')
-        console.print(f"File '{filename}' saved.", style="bold green")
-        
+        """edit FILE: line editor backed by a piece table; saves atomically."""
+        editor.LineEditor(filename).run()
+
     def rename_item(self, args):
         if len(args) < 2:
             console.print("Usage: rename <old_name> <new_name>", style="bold red")
@@ -85,29 +532,163 @@ class Commands:
                 console.print("Item not found.", style="bold red")
 
     def move_file(self, args):
+        args, options = self.copy_options(args)
         if len(args) < 2:
-            console.print("Usage: move <source> <destination>", style="bold red")
+            console.print("Usage: move [-j N] <source> <destination>", style="bold red")
             return
-        src, dest = args
-        with lock:
-            try:
-                shutil.move(src, dest)
+        src, dest = args[0], args[1]
+        try:
+            job = fastcopy.move(src, dest, workers=options["workers"])
+            if job and job.errors:
+                self.report_copy_errors(job)
+                console.print(f"Source '{src}' kept because some files failed to copy.", style="bold yellow")
+            else:
                 console.print(f"Moved '{src}' to '{dest}'", style="bold green")
-            except Exception as e:
-                console.print(str(e), style="bold red")
+        except Exception as e:
+            console.print(str(e), style="bold red")
 
-    def copy_file(args):
+    def copy_file(self, args):
+        args, options = self.copy_options(args)
         if len(args) < 2:
-            console.print("Usage: copy <source> <destination>", style="bold red")
+            console.print("Usage: copy [-r] [-j N] <source> <destination>", style="bold red")
             return
-        src, dest = args
-        with lock:
-            try:
-                shutil.copy(src, dest)
-                console.print(f"Copied '{src}' to '{dest}'", style="bold green")
-            except Exception as e:
-                console.print(str(e), style="bold red")
+        src, dest = args[0], args[1]
+        try:
+            job = fastcopy.copy(src, dest, recursive=options["recursive"], workers=options["workers"])
+            if job.errors:
+                self.report_copy_errors(job)
+            else:
+                console.print(f"Copied '{src}' to '{dest}' ({job.files} files, {format_size(job.bytes)})", style="bold green")
+        except Exception as e:
+            console.print(str(e), style="bold red")
+
+    def copy_options(self, args):
+        options = {"recursive": False, "workers": fastcopy.DEFAULT_WORKERS}
+        rest = []
+        args = list(args)
+        while args:
+            arg = args.pop(0)
+            if arg in ("-r", "-R", "--recursive"):
+                options["recursive"] = True
+            elif arg in ("-j", "--jobs") and args:
+                options["workers"] = int(args.pop(0))
+            else:
+                rest.append(arg)
+        return rest, options
+
+    def report_copy_errors(self, job):
+        for path, error in job.errors[:10]:
+            console.print(f"{path}: {error}", style="bold red", markup=False)
+        if len(job.errors) > 10:
+            console.print(f"... and {len(job.errors) - 10} more errors", style="bold red")
                 
+    # Search
+    def find_files(self, args):
+        """find [path ...] [-name GLOB] [-iname GLOB] [-type f|d|l] [-size [+-]N[kMG]] [-mtime [+-]DAYS] [--all] [-j N]"""
+        usage = "Usage: find [path ...] [-name GLOB] [-iname GLOB] [-type f|d|l] [-size [+-]N[kMG]] [-mtime [+-]DAYS] [--all] [-j N]"
+        roots, filters, workers, skip = [], {}, search.DEFAULT_WORKERS, search.SKIP_DIRS
+        args = list(args)
+        try:
+            while args:
+                arg = args.pop(0)
+                if arg in ("-name", "-iname", "-type", "-size", "-mtime"):
+                    filters[arg.lstrip("-").replace("type", "kind")] = args.pop(0)
+                elif arg == "-j":
+                    workers = int(args.pop(0))
+                elif arg == "--all":
+                    skip = set()
+                elif arg.startswith("-"):
+                    raise ValueError(f"unknown option {arg}")
+                else:
+                    roots.append(arg)
+            predicate = search.FindFilter(**filters)
+        except (ValueError, IndexError) as e:
+            console.print(f"find: {e}" if str(e) else "find: missing argument", style="bold red")
+            console.print(usage, style="bold yellow", markup=False)
+            return
+
+        roots = existing_paths("find", roots or ["."])
+        if not roots:
+            return
+        out = LineBuffer()
+        found = 0
+        try:
+            for path in search.find(roots, predicate, workers, skip):
+                out.add(path)
+                found += 1
+        except KeyboardInterrupt:
+            console.print("find: interrupted", style="bold yellow")
+        finally:
+            out.flush()
+        console.print(f"{found} match(es)", style="bold cyan")
+
+    def grep(self, args):
+        """grep [-r] [-i] [-l] [-c] [--all] [-j N] PATTERN [path ...]"""
+        usage = "Usage: grep [-r] [-i] [-l] [-c] [--all] [-j N] PATTERN [path ...]"
+        options = {"r": False, "i": False, "l": False, "c": False}
+        workers, skip, rest = search.DEFAULT_WORKERS, search.SKIP_DIRS, []
+        args = list(args)
+        try:
+            while args:
+                arg = args.pop(0)
+                if arg == "-j":
+                    workers = int(args.pop(0))
+                elif arg == "--all":
+                    skip = set()
+                elif arg.startswith("-") and len(arg) > 1 and not rest:
+                    for flag in arg[1:]:
+                        if flag not in options:
+                            raise ValueError(f"unknown option -{flag}")
+                        options[flag] = True
+                else:
+                    rest.append(arg)
+            if not rest:
+                raise ValueError("missing pattern")
+            regex = search.compile_pattern(rest[0], options["i"])
+        except (ValueError, IndexError, search.re.error) as e:
+            console.print(f"grep: {e}", style="bold red", markup=False)
+            console.print(usage, style="bold yellow", markup=False)
+            return
+
+        paths = rest[1:] or (["."] if options["r"] else [])
+        if not paths:
+            console.print("grep: no files given (use -r to search the current directory)", style="bold red")
+            return
+        paths = existing_paths("grep", paths)
+        if options["r"]:
+            files = search.walk_files(paths, workers, skip)
+        else:
+            files = []
+            for path in paths:
+                if os.path.isdir(path):
+                    console.print(f"grep: {path}: Is a directory", style="bold yellow", markup=False)
+                else:
+                    files.append(path)
+        mode = "files" if options["l"] else "count" if options["c"] else "lines"
+        show_path = options["r"] or len(files) > 1
+
+        out = LineBuffer()
+        try:
+            if not options["r"] and len(files) == 1:
+                # a single (possibly huge) file streams straight from the mmap scan
+                emit = (lambda line: out.add(f"{files[0]}:{line}")) if show_path else out.add
+                results = [(files[0], search.grep_file(files[0], regex, mode, emit), [])]
+            else:
+                results = search.grep_many(files, regex, mode, workers)
+            for path, count, lines in results:
+                if count < 0 and not options["r"]:
+                    out.add(f"grep: {path}: binary or unreadable file skipped")
+                elif mode == "files" and count > 0:
+                    out.add(path)
+                elif mode == "count" and count >= 0:
+                    out.add(f"{path}:{count}" if show_path else str(count))
+                for line in lines:
+                    out.add(f"{path}:{line}" if show_path else line)
+        except KeyboardInterrupt:
+            console.print("grep: interrupted", style="bold yellow")
+        finally:
+            out.flush()
+
     # Built-in Calculator
     def math_help(self, *args):
         """Displays available mathematical functions and their usage."""
@@ -157,30 +738,63 @@ class Commands:
         
         console.print(help_text, style="bold cyan")
     
+    def vector_calc(self, args):
+        """calc EXPR for VAR in A..B [step S] | @file.csv:COLUMN [--out FILE]: one NumPy pass over all values."""
+        import vectorcalc
+        split = args.index("for")
+        expression, rest = " ".join(args[:split]), args[split + 1:]
+        out_path = None
+        if "--out" in rest:
+            at = rest.index("--out")
+            out_path = rest[at + 1] if at + 1 < len(rest) else None
+            if out_path is None:
+                raise ValueError("--out needs a file name")
+            rest = rest[:at] + rest[at + 2:]
+        if len(rest) not in (3, 5) or rest[1] != "in" or (len(rest) == 5 and rest[3] != "step"):
+            raise ValueError("expected: calc EXPR for VAR in A..B [step S] or calc EXPR for VAR in @file.csv:COLUMN")
+        variable, source = rest[0], rest[2]
+        step = rest[4] if len(rest) == 5 else None
+
+        start = time.perf_counter()
+        summary = vectorcalc.run(expression, variable, source, step, out_path)
+        elapsed = time.perf_counter() - start
+        table = Table(title=f"{expression} for {variable} in {source}", style="cyan")
+        table.add_column("Statistic", style="bold yellow")
+        table.add_column("Value", justify="right", style="bold green")
+        for name, value in summary.rows():
+            table.add_row(name, value)
+        console.print(table)
+        if out_path:
+            console.print(f"Results written to {out_path}", style="bold cyan", markup=False)
+        console.print(f"Evaluated in {elapsed:.3f}s", style="dim")
+
     def calculator(self, args):
         if not args:
-            console.print("Usage:\n- calc <expression>\n- calc diff <expression> <variable>\n- calc integrate <expression> <variable>", style="bold red")
+            console.print("Usage:\n- calc <expression>\n- calc <expression> for x in 0..10 [step 0.1] [--out FILE]\n- calc <expression> for x in @data.csv:column\n- calc diff <expression> <variable> [--timeout S]\n- calc integrate <expression> <variable> [--timeout S]", style="bold red", markup=False)
             return
         try:
             command = args[0]
 
-            if command == "diff" and len(args) >= 3:
-                expression = " ".join(args[1:-1])
-                var = symbols(args[-1])
-                result = diff(sympify(expression), var)
-                console.print(f"Derivative of [bold yellow]{pretty(expression)}[/bold yellow] w.r.t [cyan]{var}[/cyan]:\n{pretty(result)}", style="bold green")
-
+            if command in ("diff", "integrate"):
+                from sympy import symbols, sympify, srepr, pretty
+                import symbolic
+                args, timeout = symbolic.pop_timeout(args)
 
-            elif command == "integrate" and len(args) >= 3:
+            if command in ("diff", "integrate") and len(args) >= 3:
                 expression = " ".join(args[1:-1])
                 var = symbols(args[-1])
-                result = integrate(sympify(expression), var)
-                console.print(f"Integral of [bold yellow]{pretty(expression)}[/bold yellow] w.r.t [cyan]{var}[/cyan]:\n{pretty(result)}", style="bold green")
+                # runs in the symbolic worker: Ctrl-C or the timeout stops it without killing the shell
+                result = sympify(symbolic.engine.run(command, [srepr(sympify(expression)), srepr(var)], timeout))
+                label = "Derivative" if command == "diff" else "Integral"
+                console.print(f"{label} of [bold yellow]{pretty(expression)}[/bold yellow] w.r.t [cyan]{var}[/cyan]:\n{pretty(result)}", style="bold green")
+
+            elif "for" in args:
+                self.vector_calc(args)
 
             else:
                 expression = " ".join(args)
-                result = eval(expression, {"__builtins__": None}, math.__dict__)
+                result = mathexpr.evaluate(expression)
                 console.print(f"Result: {result}", style="bold green")
 
         except Exception as e:
-            console.print(f"Error: {e}", style="bold red")
+            console.print(f"Error: {e}", style="bold red", markup=False)
@@ -1,40 +1,49 @@
-import os, time, psutil, json, pyperclip, random, string, threading, time, pyfiglet, config
+import time
+_startup = time.perf_counter()
+
+import os, pyperclip, random, shlex, string, threading, sys, argparse, pyfiglet
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, ALL_COMPLETED, wait
 from rich.console import Console
 from rich.prompt import Prompt
 
-# dependencies
-from weather import Weather
+# dependencies (heavy subsystems are imported lazily through the registry)
+from registry import CommandRegistry
+from userstore import UserStore
+from passwords import hash_password, verify_password, verify_pool
+from segments import segments
 from task import Task
-from linux_commands import Commands
-from git_commands import Git
 from terminals import Terminal
-from song import Song
-from equations import Equations
-from game import Game
-from statistical import StatisticsCalculator
-from pybot import PyBotChat
-from graphs import GraphPlotter
 
 console = Console()
-USER_FILE = "users.json"
+# users.json is only read once, to migrate existing accounts into the SQLite store
+USER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "users.json")
 lock = threading.Lock()
 scheduled_jobs = {}
 commands = {} 
 stop_scheduler = False
 prompt_flag = True
+show_timing = False
+
+# read-only commands batch mode may run concurrently; every other line (file and git changes,
+# shell state, prompts) waits for earlier lines to finish and holds back later ones
+BATCH_CONCURRENT = {"ls", "sysinfo", "find", "grep", "cat", "head", "tail", "du", "tree", "checksum", "dupes",
+                    "processes", "network", "calc", "stats", "equation", "math-help",
+                    "git-status", "git-branches", "git-history", "git-help"}
+# options that make an otherwise read-only command write a file
+BATCH_WRITE_OPTIONS = {"--out"}
+
+def batch_barrier(command):
+    return command[0] not in BATCH_CONCURRENT or any(arg in BATCH_WRITE_OPTIONS for arg in command[1:])
 
 # Load users
-def load_users():
-    with lock:
-        if os.path.exists(USER_FILE):
-            with open(USER_FILE, "r") as file:
-                return json.load(file)
-    return {}
+user_store = None
 
-def save_users(users):
+def get_user_store():
+    global user_store
     with lock:
-        with open(USER_FILE, "w") as file:
-            json.dump(users, file, indent=4)
+        if user_store is None:
+            user_store = UserStore(legacy_json=USER_FILE)
+    return user_store
 
 def clipboard_copy(text):
     with lock:
@@ -47,44 +56,65 @@ def clipboard_paste():
 
 # User Authentication
 def register_user():
-    users = load_users()
+    store = get_user_store()
     username = Prompt.ask("Enter new username")
     role = Prompt.ask("Assign role (admin/user)", choices=["admin", "user"], default="user")
-    if username in users:
+    if store.exists(username):
         console.print("User already exists!", style="bold red")
         return register_user()
     password = Prompt.ask("Enter password", password=True)
-    users[username] = {"password": password, "role": role}
-    save_users(users)
+    if not store.add(username, hash_password(password), role):
+        console.print("User already exists!", style="bold red")
+        return register_user()
     console.print("User registered successfully!", style="bold green")
     return username, role
 
+def authenticate_async(username, password):
+    """Checks credentials on the password worker; returns a Future of the role (None if invalid).
+
+    Legacy plaintext or outdated hashes are re-hashed with the current cost settings.
+    """
+    store = get_user_store()
+
+    def check():
+        user = store.get(username)
+        if not user:
+            return None
+        matches, needs_rehash = verify_password(password, user["password"])
+        if not matches:
+            return None
+        if needs_rehash:
+            store.set_password(username, hash_password(password))
+        return user["role"]
+
+    return verify_pool.submit(check)
+
+def authenticate(username, password):
+    """Returns the user's role if the credentials are valid, otherwise None."""
+    return authenticate_async(username, password).result()
+
+def warm_up():
+    """Startup work overlapped with the password KDF."""
+    try:
+        registry.load_module("linux_commands")
+    except ImportError:
+        pass
+    segments.prefetch()
+    segments.end_round()
+
 def login_user():
-    users = load_users()
     username = Prompt.ask("Enter username")
     password = Prompt.ask("Enter password", password=True)
-    if username in users and users[username]["password"] == password:
+    pending = authenticate_async(username, password)
+    warm_up()
+    role = pending.result()
+    if role:
         console.print("Login successful!", style="bold green")
-        return username, users[username]["role"]
+        return username, role
     else:
         console.print("Invalid credentials!", style="bold red")
         return login_user()
 
-# Synchronization
-def list_processes(*args):
-    for proc in psutil.process_iter(['pid', 'name']):
-        console.print(f"{proc.info['pid']} - {proc.info['name']}")
-
-def kill_process(args):
-    if not args:
-        console.print("Usage: kill <PID>", style="bold red")
-        return
-    try:
-        psutil.Process(int(args[0])).terminate()
-        console.print(f"Process {args[0]} terminated", style="bold red")
-    except Exception as e:
-        console.print(str(e), style="bold red")
-
 def generate_password(*args):
     length = Prompt.ask("Enter password length (default 12)", default="12")
     try:
@@ -105,31 +135,334 @@ def generate_password(*args):
 terminal = Terminal()
 
 def display_prompt(username):
-    if config.current_terminal_layout == 1:  
-        Terminal().terminal_1()
-    elif config.current_terminal_layout == 2:
-        Terminal().terminal_2()
-    elif config.current_terminal_layout == 3:
-        Terminal().terminal_3()
-    elif config.current_terminal_layout == 4:
-        Terminal().terminal_4()
-    elif config.current_terminal_layout == 5:
-        Terminal().terminal_5()
-    elif config.current_terminal_layout == 6:
-        Terminal().terminal_6()
-    elif config.current_terminal_layout == 7:
-        Terminal().terminal_7()
-    elif config.current_terminal_layout == 8:
-        Terminal().terminal_8()
-        
-    console.print(terminal.get_prompt())
+    terminal.display()
        
     
 # clear console 
 def clear(*args):
     os.system('cls' if os.name == 'nt' else 'clear')
 
-def main():
+# Command timing
+def toggle_timing(args):
+    global show_timing
+    if args and args[0] in ("on", "off"):
+        show_timing = args[0] == "on"
+    else:
+        show_timing = not show_timing
+    console.print(f"Command timing {'enabled' if show_timing else 'disabled'}", style="bold cyan")
+
+def child_cpu_time():
+    times = os.times()
+    return times.children_user + times.children_system
+
+def run_timed(func, *args):
+    """Runs func and returns (wall, cpu, children) seconds measured with monotonic clocks."""
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    child_start = child_cpu_time()
+    try:
+        func(*args)
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        children = child_cpu_time() - child_start
+    return wall, cpu, children
+
+def report_timing(wall, cpu, children):
+    console.print(f"Execution time: wall {wall * 1000:.2f} ms | cpu {cpu * 1000:.2f} ms | children {children * 1000:.2f} ms", style="bold yellow")
+
+# File watching
+def watch_command(args):
+    """watch [path ...] [--debounce SECONDS] [--poll] -- COMMAND [ARGS]: reruns COMMAND when files change."""
+    usage = "Usage: watch [path ...] [--debounce SECONDS] [--poll] -- COMMAND [ARGS]"
+    if "--" not in args or args.index("--") == len(args) - 1:
+        console.print(usage, style="bold red", markup=False)
+        console.print("Example: watch src -- grep -r -c TODO src", style="bold yellow")
+        return
+    split = args.index("--")
+    options, command = args[:split], [args[split + 1].lower(), *args[split + 2:]]
+    paths, debounce, poll = [], None, False
+    try:
+        while options:
+            arg = options.pop(0)
+            if arg == "--debounce":
+                debounce = float(options.pop(0))
+            elif arg == "--poll":
+                poll = True
+            else:
+                paths.append(arg)
+    except (ValueError, IndexError):
+        console.print(usage, style="bold red", markup=False)
+        return
+    paths = paths or ["."]
+    missing = [path for path in paths if not os.path.exists(path)]
+    if missing:
+        console.print(f"watch: {missing[0]}: No such file or directory", style="bold red", markup=False)
+        return
+
+    import watcher
+    def started(w):
+        console.print(f"Watching {', '.join(paths)} ({w.method}). Press Ctrl-C to stop.", style="bold cyan", markup=False)
+        dispatch(command[0], command[1:])
+
+    def changed(changes):
+        console.print(f"\n[watch] {len(changes)} change(s), running: {' '.join(command)}", style="bold cyan", markup=False)
+        dispatch(command[0], command[1:])
+
+    try:
+        watcher.watch(paths, changed, debounce or watcher.DEBOUNCE, poll, on_start=started)
+    except KeyboardInterrupt:
+        console.print("\nStopped watching.", style="bold yellow")
+
+# Command registry: only names and module paths are recorded here, the
+# module behind a command is imported the first time that command runs.
+registry = CommandRegistry()
+
+def build_registry():
+    join_args = lambda fn, args: fn(" ".join(args))
+    no_args = lambda fn, args: fn()
+
+    registry.register("rename", "linux_commands", "Commands.rename_item")
+    registry.register("move", "linux_commands", "Commands.move_file")
+    registry.register("copy", "linux_commands", "Commands.copy_file")
+    registry.register("find", "linux_commands", "Commands.find_files")
+    registry.register("grep", "linux_commands", "Commands.grep")
+    registry.register("cat", "linux_commands", "Commands.cat")
+    registry.register("head", "linux_commands", "Commands.head")
+    registry.register("tail", "linux_commands", "Commands.tail")
+    registry.register("du", "linux_commands", "Commands.disk_usage")
+    registry.register("tree", "linux_commands", "Commands.tree")
+    registry.register("checksum", "linux_commands", "Commands.checksum")
+    registry.register("dupes", "linux_commands", "Commands.dupes")
+    registry.register("processes", "processes", "Processes.list_processes")
+    registry.register("kill", "processes", "Processes.kill")
+    registry.register("network", "linux_commands", "Commands.network_info")
+    registry.add("copytext", clipboard_copy)
+    registry.add("paste", clipboard_paste)
+    registry.add("password", generate_password)
+    registry.register("calc", "linux_commands", "Commands.calculator")
+    registry.register("stats", "statistical", "StatisticsCalculator.calculate_statistics", call=no_args)
+    registry.register("equation", "equations", "Equations.solve_equation")
+    registry.register("differential", "equations", "Equations.solve_differential")
+    registry.register("math-help", "linux_commands", "Commands.math_help")
+    registry.register("weather", "weather", "Weather.get_weather")
+    registry.register("schedule", "task", "Task.schedule_task")
+    registry.register("tasks", "task", "Task.list_scheduled_tasks")
+    registry.register("unschedule", "task", "Task.remove_scheduled_task")
+    registry.register("stop", "task", "Task.stop_running_tasks")
+    registry.add("cls", clear)
+    registry.add("timing", toggle_timing)
+    registry.add("watch", watch_command)
+    registry.add("terminal", terminal.change_terminal)
+    registry.register("game", "game", "Game.play_game", call=join_args)
+    registry.register("pybot", "pybot", "PyBotChat.chat_loop", call=no_args)
+    registry.register("plot", "graphs", "GraphPlotter.run", call=no_args)
+    registry.add("exit", lambda _: exit())
+
+    # Git Commands (Using Git Class)
+    registry.register("git-status", "git_commands", "Git.git_status")
+    registry.register("git-branches", "git_commands", "Git.git_branches")
+    registry.register("git-create", "git_commands", "Git.git_create_branch")
+    registry.register("git-switch", "git_commands", "Git.git_switch_branch")
+    registry.register("git-push", "git_commands", "Git.git_push")
+    registry.register("git-pull", "git_commands", "Git.git_pull")
+    registry.register("git-merge", "git_commands", "Git.git_merge")
+    registry.register("git-delete", "git_commands", "Git.git_delete_branch")
+    registry.register("git-clone", "git_commands", "Git.git_clone")
+    registry.register("git-add", "git_commands", "Git.git_add")
+    registry.register("git-commit", "git_commands", "Git.git_commit")
+
+    # Unique Git Features
+    registry.register("play", "song", "Song.play_song", call=join_args)
+    registry.register("git-smart", "git_commands", "Git.git_smart_commit")
+    registry.register("git-help", "git_commands", "Git.git_help")
+    registry.register("git-history", "git_commands", "Git.git_history")
+    registry.register("git-undo", "git_commands", "Git.git_undo")
+    registry.register("git-stash", "git_commands", "Git.git_stash")
+    registry.register("git-recover", "git_commands", "Git.git_recover")
+    registry.register("git-dashboard", "git_commands", "Git.git_dashboard")
+    registry.register("git-auto_merge", "git_commands", "Git.git_auto_merge")
+    registry.register("git-voice", "git_commands", "Git.git_voice_command")
+    registry.register("git-reminder", "git_commands", "Git.git_reminder")
+    registry.register("git-offline_sync", "git_commands", "Git.git_offline_sync")
+    return registry
+
+def dispatch(cmd, args):
+    """Runs one command; returns False if it is unknown or unavailable, so batch mode can fail."""
+    if cmd in registry:
+        try:
+            registry.run(cmd, args)
+        except ImportError as e:
+            console.print(f"Command '{cmd}' is unavailable: {e}", style="bold red")
+            return False
+        return True
+
+    cmds = registry.instance("linux_commands", "Commands")
+    if cmd == "ls":
+        cmds.list_files(args)
+    elif cmd == "touch" and args:
+        cmds.create_file(args[0])
+    elif cmd == "rm" and args:
+        cmds.delete_file(args[0])
+    elif cmd == "mkdir" and args:
+        cmds.create_folder(args[0])
+    elif cmd == "rmdir" and args:
+        cmds.delete_folder(args[0])
+    elif cmd == "cd" and args:
+        cmds.change_directory(args[0])
+    elif cmd == "edit" and args:
+        cmds.text_editor(args[0])
+    elif cmd == "sysinfo":
+        cmds.system_info()
+    else:
+        console.print("Invalid command!", style="bold red")
+        return False
+    return True
+
+def parse_command(line):
+    """Splits a command line the same way for interactive and batch input.
+
+    Only the command name is case-insensitive; arguments such as paths and
+    flags (ls -S / -s) keep their case. Quotes group words as in a POSIX shell
+    (grep -r "def main" src); on Windows backslashes stay path separators.
+    Raises ValueError for an unclosed quote.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    if os.name == "nt":
+        words = [word[1:-1] if len(word) > 1 and word[0] == word[-1] and word[0] in "\"'" else word
+                 for word in shlex.split(line, posix=False)]
+    else:
+        words = shlex.split(line)
+    if not words:
+        return None
+    cmd, *args = words
+    return [cmd.lower(), *args]
+
+def batch_commands(lines):
+    """Yields (line number, command) for each command line; command is None if the line does not parse."""
+    for number, line in enumerate(lines, 1):
+        try:
+            command = parse_command(line)
+        except ValueError as e:
+            console.print(f"line {number}: {e}", style="bold red", markup=False)
+            yield number, None
+            continue
+        if command:
+            yield number, command
+
+# Batch mode
+def env_login():
+    """Authenticates from PYSHELL_TOKEN (user:password) or PYSHELL_USER/PYSHELL_PASSWORD.
+
+    Returns (username, role), None when no credentials are set, or () when they are wrong.
+    """
+    token = os.getenv("PYSHELL_TOKEN")
+    if token and ":" in token:
+        username, password = token.split(":", 1)
+    else:
+        username, password = os.getenv("PYSHELL_USER"), os.getenv("PYSHELL_PASSWORD")
+    if not username or password is None:
+        return None
+    role = authenticate(username, password)
+    return (username, role) if role else ()
+
+def run_batch_line(number, command):
+    cmd, *args = command
+    known = []
+    try:
+        wall, cpu, children = run_timed(lambda: known.append(dispatch(cmd, args)))
+        if show_timing:
+            report_timing(wall, cpu, children)
+        if not known[0]:
+            console.print(f"line {number}: {cmd}: unknown or unavailable command", style="bold red", markup=False)
+        return known[0]
+    except SystemExit:
+        raise
+    except Exception as e:
+        console.print(f"line {number}: {cmd}: {e}", style="bold red")
+        return False
+
+def run_batch(lines, jobs=1):
+    """Runs commands from an iterable of lines and returns the number of failed lines.
+
+    With jobs > 1 read-only lines run on a worker pool; any other line (see
+    batch_barrier) waits for every earlier line to finish before it runs.
+    """
+    failures = 0
+    if jobs <= 1:
+        for number, command in batch_commands(lines):
+            failures += command is None or not run_batch_line(number, command)
+        return failures
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        pending = set()
+
+        def drain(return_when):
+            nonlocal pending, failures
+            done, pending = wait(pending, return_when=return_when)
+            failures += sum(not future.result() for future in done)
+
+        for number, command in batch_commands(lines):
+            if command is None:
+                failures += 1
+                continue
+            if batch_barrier(command):
+                drain(ALL_COMPLETED)
+                failures += not run_batch_line(number, command)
+                continue
+            if len(pending) >= jobs * 4:
+                drain(FIRST_COMPLETED)
+            pending.add(pool.submit(run_batch_line, number, command))
+        drain(ALL_COMPLETED)
+    return failures
+
+def batch_main(options):
+    global username
+    login = env_login()
+    if login is None:
+        console.print("Batch mode needs PYSHELL_TOKEN=user:password or PYSHELL_USER/PYSHELL_PASSWORD", style="bold red")
+        sys.exit(2)
+    if not login:
+        console.print("Batch mode: invalid credentials in PYSHELL_TOKEN or PYSHELL_USER/PYSHELL_PASSWORD", style="bold red")
+        sys.exit(2)
+    username, role = login
+
+    if options.file and options.file != "-":
+        with open(options.file, "r") as script:
+            failures = run_batch(script, options.jobs)
+    else:
+        failures = run_batch(sys.stdin, options.jobs)
+    sys.exit(1 if failures else 0)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="pyshell", description="PyShell - Python Based CLI")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print per-module import times and exit")
+    parser.add_argument("-f", "--file", metavar="SCRIPT",
+                        help="run commands from a file ('-' for stdin) without prompts")
+    parser.add_argument("-j", "--jobs", type=int, default=1, metavar="N",
+                        help="run independent script lines on N workers")
+    return parser.parse_args(argv)
+
+def startup_profile():
+    core_time = time.perf_counter() - _startup
+    registry.warm_up()
+    registry.startup_report(core_time)
+
+def main(argv=None):
+    options = parse_args(argv)
+    build_registry()
+
+    if options.startup_profile:
+        startup_profile()
+        return
+
+    if options.file or not sys.stdin.isatty():
+        batch_main(options)
+        return
+
     console.clear()
     ascii_banner = pyfiglet.figlet_format("PyShell")
     print(ascii_banner)
@@ -137,119 +470,29 @@ def main():
     global username
     username, role = register_user() if Prompt.ask("New user?", choices=["y", "n"]) == "y" else login_user()
     
-    # Objects
-    cmds = Commands()
-    task = Task()
-    weather = Weather()
-    terminl = Terminal()
-    git = Git()
-    eq = Equations()
-    stats = StatisticsCalculator()
-    graph = GraphPlotter()
-    
-    commands = {
-        "rename": cmds.rename_item,
-        "move": cmds.move_file,
-        "copy": cmds.copy_file,
-        "processes": list_processes,
-        "kill": kill_process,
-        "network": cmds.network_info,
-        "copytext": clipboard_copy,
-        "paste": clipboard_paste,
-        "password": generate_password,
-        "calc": cmds.calculator,
-        "stats": lambda args: stats.calculate_statistics(),
-        "equation": eq.solve_equation,
-        "differential": lambda args: eq.solve_differential(args),
-        "math-help": cmds.math_help,
-        "weather": weather.get_weather,
-        "schedule": task.schedule_task,  
-        "tasks": task.list_scheduled_tasks,  
-        "unschedule": task.remove_scheduled_task,
-        "stop": task.stop_running_tasks,
-        "cls": clear,
-        "terminal": terminl.change_terminal,
-        "game": lambda args: Game.play_game(" ".join(args)),
-        "pybot": lambda args: PyBotChat().chat_loop(),
-        "plot": lambda args: graph.run(),
-        "exit": lambda _: exit(),
-        
-        # Git Commands (Using Git Class)
-        "git-status": git.git_status,
-        "git-branches": git.git_branches,
-        "git-create": git.git_create_branch,
-        "git-switch": git.git_switch_branch,
-        "git-push": git.git_push,
-        "git-pull": git.git_pull,
-        "git-merge": git.git_merge,
-        "git-delete": git.git_delete_branch,
-        "git-clone": git.git_clone,
-        "git-add": git.git_add,
-        "git-commit": git.git_commit,
-        
-        # Unique Git Features
-        "play": lambda args: Song.play_song(" ".join(args)),
-        "git-smart": git.git_smart_commit,
-        "git-help": git.git_help,
-        "git-history": git.git_history,
-        "git-undo": git.git_undo,
-        "git-stash": git.git_stash,
-        "git-recover": git.git_recover,
-        "git-dashboard": git.git_dashboard,
-        "git-auto_merge": git.git_auto_merge,
-        "git-voice": git.git_voice_command,
-        "git-reminder": git.git_reminder,
-        "git-offline_sync": git.git_offline_sync,
-    }
-    
     scheduler_thread = threading.Thread(target=Task().run_scheduler, daemon=True)
     scheduler_thread.start()
     
     while True:
         display_prompt(username)
-        command = input().strip().lower().split()
-        
-        if not command:
+        try:
+            line = input()
+        finally:
+            terminal.deactivate()
+        try:
+            command = parse_command(line)
+        except ValueError as e:
+            console.print(f"Syntax error: {e}", style="bold red", markup=False)
             continue
         
-        cmd, *args = command
-        
-        start_time = time.time()
-        
         if not command:
             continue
         
         cmd, *args = command
-        start_time = time.time()
-
-        if cmd in commands:
-            commands[cmd](args)
-        else:
-            if cmd == "ls":
-                cmds.list_files()
-            elif cmd == "touch" and args:
-                cmds.create_file(args[0])
-            elif cmd == "rm" and args:
-                cmds.delete_file(args[0])
-            elif cmd == "mkdir" and args:
-                cmds.create_folder(args[0])
-            elif cmd == "rmdir" and args:
-                cmds.delete_folder(args[0])
-            elif cmd == "cd" and args:
-                cmds.change_directory(args[0])
-            elif cmd == "edit" and args:
-                cmds.text_editor(args[0])
-            elif cmd == "sysinfo":
-                cmds.system_info()
-            elif cmd == "exit":
-                console.print("Exiting PyShell...", style="bold red")
-                break
-            else:
-                console.print("Invalid command!", style="bold red")
-        
-        exec_time = time.time() - start_time
-        console.print(f"Execution time: {exec_time:.4f} seconds", style="bold yellow")
-        time.sleep(1)
+
+        wall, cpu, children = run_timed(dispatch, cmd, args)
+        if show_timing:
+            report_timing(wall, cpu, children)
 
 if __name__ == "__main__":
     main()
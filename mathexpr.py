@@ -0,0 +1,95 @@
+# Safe math expression evaluator
+
+import ast, math
+from functools import lru_cache
+
+CACHE_SIZE = 512
+MAX_POWER_BITS = 100000
+
+def safe_pow(base, exponent):
+    """`**` with a guard against integer powers that would take minutes (9**9**9)."""
+    if isinstance(base, int) and isinstance(exponent, int) and abs(base) > 1 and exponent > 0:
+        if exponent * math.log2(abs(base)) > MAX_POWER_BITS:
+            raise OverflowError("result too large")
+    return base ** exponent
+
+def safe_factorial(x):
+    if x > 10000:
+        raise OverflowError("factorial argument too large")
+    return math.factorial(x)
+
+# names an expression may use; everything public in math plus a few builtins
+NAMESPACE = {name: getattr(math, name) for name in dir(math) if not name.startswith("_")}
+NAMESPACE.update({"abs": abs, "round": round, "min": min, "max": max, "pow": safe_pow,
+                  "factorial": safe_factorial, "__pow__": safe_pow})
+
+BIN_OPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+UNARY_OPS = (ast.UAdd, ast.USub)
+COMPARE_OPS = (ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+
+class Checker(ast.NodeTransformer):
+    """Rejects anything outside arithmetic on numbers, allowed names and calls to them.
+
+    There is no attribute access, subscripting, lambda or comprehension, so a
+    checked expression cannot reach objects beyond NAMESPACE. `a ** b` is
+    rewritten to the guarded power function.
+    """
+
+    def __init__(self, names):
+        self.names = names
+
+    def generic_visit(self, node):
+        raise ValueError(f"'{type(node).__name__}' is not allowed in calc expressions")
+
+    def visit_Expression(self, node):
+        node.body = self.visit(node.body)
+        return node
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float, complex)):
+            raise ValueError(f"unsupported constant {node.value!r}")
+        return node
+
+    def visit_Name(self, node):
+        if node.id not in self.names or node.id.startswith("__"):
+            raise ValueError(f"unknown name '{node.id}'")
+        return node
+
+    def visit_BinOp(self, node):
+        if not isinstance(node.op, BIN_OPS):
+            raise ValueError(f"operator '{type(node.op).__name__}' is not allowed")
+        node.left, node.right = self.visit(node.left), self.visit(node.right)
+        if isinstance(node.op, ast.Pow):
+            return ast.copy_location(ast.Call(ast.Name("__pow__", ast.Load()), [node.left, node.right], []), node)
+        return node
+
+    def visit_UnaryOp(self, node):
+        if not isinstance(node.op, UNARY_OPS):
+            raise ValueError(f"operator '{type(node.op).__name__}' is not allowed")
+        node.operand = self.visit(node.operand)
+        return node
+
+    def visit_Compare(self, node):
+        if not all(isinstance(op, COMPARE_OPS) for op in node.ops):
+            raise ValueError("comparison not allowed")
+        node.left = self.visit(node.left)
+        node.comparators = [self.visit(c) for c in node.comparators]
+        return node
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.keywords:
+            raise ValueError("only plain calls like sqrt(x) are allowed")
+        node.func = self.visit_Name(node.func)
+        node.args = [self.visit(arg) for arg in node.args]
+        return node
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(expression, names=frozenset(NAMESPACE)):
+    """Parses, checks and compiles once; repeated expressions come straight from the LRU cache."""
+    tree = ast.parse(expression.strip(), mode="eval")
+    tree = ast.fix_missing_locations(Checker(names).visit(tree))
+    return compile(tree, "<calc>", "eval")
+
+def evaluate(expression, namespace=NAMESPACE):
+    code = compile_expression(expression) if namespace is NAMESPACE else compile_expression(expression, frozenset(namespace))
+    return eval(code, {"__builtins__": {}}, namespace)
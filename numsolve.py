@@ -0,0 +1,92 @@
+# Numeric equation solving (linear solver or multi-start root finding)
+
+import numpy as np
+from sympy import lambdify, linear_eq_to_matrix
+from sympy.solvers.solveset import NonlinearError
+
+START_POINTS = 16
+START_SPREAD = 10.0
+RESIDUAL_TOLERANCE = 1e-8
+DISTINCT_TOLERANCE = 1e-6
+SPARSE_MIN_SIZE = 200
+SPARSE_MAX_DENSITY = 0.1
+
+def residuals(equations):
+    return [eq.lhs - eq.rhs for eq in equations]
+
+def linear_system(equations, variables):
+    """(A, b) as float arrays if every equation is linear in `variables`, else None."""
+    try:
+        A, b = linear_eq_to_matrix(residuals(equations), variables)
+    except NonlinearError:
+        return None
+    try:
+        return np.array(A.tolist(), dtype=float), np.array(b.tolist(), dtype=float).ravel()
+    except TypeError:
+        # coefficients still contain other symbols (parameters), so there is no numeric answer
+        return None
+
+def solve_linear(A, b):
+    """Square, well-conditioned systems use LU (sparse LU when large and mostly zeros); others least squares."""
+    rows, cols = A.shape
+    if rows == cols and np.linalg.matrix_rank(A) == cols:
+        if cols >= SPARSE_MIN_SIZE and np.count_nonzero(A) <= SPARSE_MAX_DENSITY * A.size:
+            from scipy.sparse import csc_matrix
+            from scipy.sparse.linalg import spsolve
+            return spsolve(csc_matrix(A), b), "sparse LU"
+        return np.linalg.solve(A, b), "dense LU"
+    x, _, rank, _ = np.linalg.lstsq(A, b, rcond=None)
+    if np.linalg.norm(A @ x - b) > RESIDUAL_TOLERANCE * max(1.0, np.linalg.norm(b)):
+        return None, "least squares (inconsistent system)"
+    note = "least squares" if rank == cols else "least squares, minimum-norm solution of an underdetermined system"
+    return x, note
+
+def start_points(count, size, seed=0):
+    """Deterministic spread of initial guesses: the origin, all-ones, then uniform in [-10, 10]."""
+    rng = np.random.default_rng(seed)
+    points = [np.zeros(size), np.ones(size)]
+    points += list(rng.uniform(-START_SPREAD, START_SPREAD, size=(count - 2, size)))
+    return points
+
+def solve_nonlinear(equations, variables, starts=START_POINTS):
+    from scipy.optimize import root
+    function = lambdify(variables, residuals(equations), "numpy")
+    square = len(equations) == len(variables)
+    method = "hybr" if square else "lm"
+
+    def fun(values):
+        return np.asarray(function(*values), dtype=float)
+
+    def attempt(x0):
+        try:
+            with np.errstate(all="ignore"):
+                result = root(fun, x0, method=method)
+                if np.all(np.isfinite(result.x)) and np.linalg.norm(fun(result.x)) < RESIDUAL_TOLERANCE:
+                    return result.x
+        except (ValueError, ArithmeticError, TypeError):
+            pass
+        return None
+
+    # run one after another: the residual is a Python callable invoked on every MINPACK
+    # iteration, so threads would only take turns on the GIL
+    found = [x for x in map(attempt, start_points(starts, len(variables))) if x is not None]
+
+    roots = []
+    for x in found:
+        if not any(np.allclose(x, other, atol=DISTINCT_TOLERANCE, rtol=DISTINCT_TOLERANCE) for other in roots):
+            roots.append(x)
+    roots.sort(key=lambda x: tuple(np.round(x, 9)))
+    return roots, f"{method} root finding from {starts} start points"
+
+def solve(equations, variables):
+    """Returns ([{variable: float}], method note); only real solutions are found."""
+    free = set().union(*[eq.free_symbols for eq in equations]) - set(variables)
+    if free:
+        raise ValueError(f"numeric mode needs a value for {', '.join(sorted(map(str, free)))}")
+    system = linear_system(equations, variables)
+    if system is not None:
+        x, note = solve_linear(*system)
+        roots = [] if x is None else [x]
+    else:
+        roots, note = solve_nonlinear(equations, variables)
+    return [dict(zip(variables, map(float, x))) for x in roots], note
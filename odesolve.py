@@ -0,0 +1,118 @@
+# Numeric initial-value ODE solving
+
+import numpy as np
+from sympy import Derivative, Matrix, lambdify, solve, symbols
+
+# "stiff"/"nonstiff"/"auto" pick a sensible scipy method; scipy names are accepted as-is
+METHOD_ALIASES = {"nonstiff": "RK45", "stiff": "BDF", "auto": "LSODA"}
+METHODS = {"RK45", "RK23", "DOP853", "Radau", "BDF", "LSODA"}
+IMPLICIT = {"Radau", "BDF", "LSODA"}
+RTOL, ATOL = 1e-8, 1e-10
+
+def resolve_method(name):
+    method = METHOD_ALIASES.get(name.lower(), name)
+    match = {m.lower(): m for m in METHODS}.get(method.lower())
+    if match is None:
+        raise ValueError(f"unknown method '{name}' (stiff, nonstiff, auto or one of {', '.join(sorted(METHODS))})")
+    return match
+
+class FirstOrderSystem:
+    """y^(n) = f(x, y, y', ..., y^(n-1)) rewritten as Y' = F(x, Y) and lambdified once.
+
+    `order` is the highest derivative of y(x) in the equation; the state is
+    Y = (y, y', ..., y^(n-1)). The Jacobian dF/dY is lambdified too, for the
+    implicit (stiff) methods.
+    """
+
+    def __init__(self, equation, y, x):
+        expr = (equation.lhs - equation.rhs).doit()
+        orders = [d.derivative_count for d in expr.atoms(Derivative) if d.expr == y(x)]
+        if not orders:
+            raise ValueError("the equation has no derivative of y(x)")
+        self.order = max(orders)
+        highest = Derivative(y(x), (x, self.order))
+        solved = solve(expr, highest)
+        if not solved:
+            raise ValueError(f"cannot solve the equation for {highest}")
+        self.state = symbols(f"y0:{self.order}")
+        rhs = solved[0]
+        for k in range(self.order - 1, 0, -1):
+            rhs = rhs.subs(Derivative(y(x), (x, k)), self.state[k])
+        rhs = rhs.subs(y(x), self.state[0])
+        if rhs.has(y):
+            raise ValueError("could not reduce the equation to a first-order system")
+        self.x = x
+        self.highest = highest
+        self.rhs = rhs
+        exprs = [*self.state[1:], rhs]
+        self.function = lambdify((x, self.state), exprs, "numpy")
+        self.jacobian = lambdify((x, self.state), Matrix(exprs).jacobian(self.state), "numpy")
+
+    def fun(self, t, values):
+        return np.array(self.function(t, values), dtype=float)
+
+    def jac(self, t, values):
+        return np.array(self.jacobian(t, values), dtype=float)
+
+    def integrate(self, start, stop, initial, method="auto", points=101):
+        """Integrates from x=start to x=stop; returns (x grid, states with one row per derivative)."""
+        from scipy.integrate import solve_ivp
+        if len(initial) != self.order:
+            names = ", ".join("y" + "'" * k + "(x0)" for k in range(self.order))
+            raise ValueError(f"an order-{self.order} equation needs {self.order} initial value(s): {names}")
+        method = resolve_method(method)
+        grid = np.linspace(start, stop, points)
+        # explicit methods never use a Jacobian (scipy warns if one is passed)
+        extra = {"jac": self.jac} if method in IMPLICIT else {}
+        result = solve_ivp(self.fun, (start, stop), np.asarray(initial, dtype=float), method=method, t_eval=grid,
+                           rtol=RTOL, atol=ATOL, **extra)
+        if not result.success:
+            raise ArithmeticError(f"integration failed: {result.message}")
+        return result.t, result.y, method, result.nfev
+
+def write_csv(path, grid, states):
+    names = ["x"] + ["y" + "'" * k for k in range(len(states))]
+    np.savetxt(path, np.column_stack((grid, *states)), delimiter=",", header=",".join(names), comments="", fmt="%.12g")
+
+def plot(grid, states, title):
+    import matplotlib.pyplot as plt
+    for k, values in enumerate(states):
+        plt.plot(grid, values, label="y" + "'" * k)
+    plt.xlabel("x")
+    plt.title(title)
+    plt.legend()
+    plt.grid(True)
+    plt.show()
+
+def parse_options(args):
+    """Splits the `differential` flags out of args into a dict; values stay None when not given."""
+    flags = {"--from": "start", "--to": "stop", "--init": "initial", "--method": "method",
+             "--points": "points", "--out": "out"}
+    options = dict.fromkeys(flags.values())
+    options.update(numeric=False, plot=False)
+    args = list(args)
+    while args:
+        flag = args.pop(0)
+        if flag in ("--numeric", "--plot"):
+            options[flag[2:]] = True
+        elif flag in flags and args:
+            options[flags[flag]] = args.pop(0)
+        else:
+            raise ValueError(f"unexpected argument '{flag}'")
+    if options["start"] is not None:
+        options["start"] = float(options["start"])
+    if options["stop"] is not None:
+        options["stop"] = float(options["stop"])
+    if options["initial"] is not None:
+        options["initial"] = parse_values(options["initial"])
+    options["points"] = int(options["points"] or 101)
+    if options["points"] < 2:
+        raise ValueError("--points needs at least 2")
+    options["method"] = resolve_method(options["method"] or "auto")
+    # any numeric-only option implies numeric mode
+    options["numeric"] = options["numeric"] or options["plot"] or any(
+        options[key] is not None for key in ("start", "stop", "initial", "out"))
+    return options
+
+def parse_values(text):
+    return [float(value) for value in text.replace(",", " ").split()]
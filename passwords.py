@@ -0,0 +1,62 @@
+# Password Hashing
+
+import base64, hashlib, hmac, os
+from concurrent.futures import ThreadPoolExecutor
+from settings import settings
+
+# Stored formats:
+#   scrypt$<n>$<r>$<p>$<salt>$<hash>
+#   pbkdf2_sha256$<iterations>$<salt>$<hash>
+# Anything else is a legacy plaintext password and is re-hashed on next login.
+SCHEMES = ("scrypt", "pbkdf2_sha256")
+SALT_BYTES = 16
+HASH_BYTES = 32
+
+# KDF work runs here so the caller can keep warming up while a login is checked
+verify_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="password")
+
+def b64(data):
+    return base64.b64encode(data).decode("ascii")
+
+def current_params():
+    """KDF scheme and cost parameters from the settings store."""
+    scheme = settings.get("password_scheme")
+    if scheme == "scrypt":
+        return scheme, (settings.get("scrypt_n"), settings.get("scrypt_r"), settings.get("scrypt_p"))
+    return "pbkdf2_sha256", (settings.get("pbkdf2_iterations"),)
+
+def derive(scheme, params, password, salt):
+    if scheme == "scrypt":
+        n, r, p = params
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                              maxmem=256 * n * r + 1024 * 1024, dklen=HASH_BYTES)
+    (iterations,) = params
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations, dklen=HASH_BYTES)
+
+def hash_password(password, scheme=None, params=None):
+    if scheme is None:
+        scheme, params = current_params()
+    salt = os.urandom(SALT_BYTES)
+    digest = derive(scheme, params, password, salt)
+    return "$".join([scheme, *map(str, params), b64(salt), b64(digest)])
+
+def parse(stored):
+    parts = stored.split("$")
+    if parts[0] == "scrypt" and len(parts) == 6:
+        return "scrypt", tuple(map(int, parts[1:4])), parts[4], parts[5]
+    if parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+        return "pbkdf2_sha256", (int(parts[1]),), parts[2], parts[3]
+    return None
+
+def verify_password(password, stored):
+    """Returns (matches, needs_rehash); needs_rehash is set for plaintext or outdated cost parameters."""
+    try:
+        parsed = parse(stored)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        return hmac.compare_digest(password.encode(), stored.encode()), True
+    scheme, params, salt, digest = parsed
+    candidate = derive(scheme, params, password, base64.b64decode(salt))
+    matches = hmac.compare_digest(candidate, base64.b64decode(digest))
+    return matches, (scheme, params) != current_params()
@@ -0,0 +1,189 @@
+# Process table (processes / kill)
+
+import fnmatch, os, time, psutil
+from rich.console import Console
+from rich.live import Live
+from rich.prompt import Confirm
+from rich.table import Table
+from shared import format_size
+
+console = Console()
+ATTRS = ["pid", "name", "username", "cpu_times", "memory_info"]
+SAMPLE_INTERVAL = 0.5
+SORT_KEYS = {
+    "cpu": lambda row: row["cpu"],
+    "mem": lambda row: row["rss"],
+    "pid": lambda row: -row["pid"],
+    "name": lambda row: row["name"].lower(),
+}
+
+def name_matcher(pattern):
+    """Glob if the pattern has wildcards, otherwise a case-insensitive substring match."""
+    pattern = pattern.lower()
+    if any(ch in pattern for ch in "*?["):
+        return lambda name: fnmatch.fnmatchcase((name or "").lower(), pattern)
+    return lambda name: pattern in (name or "").lower()
+
+def snapshot():
+    """One pass over all processes: {pid: info} with total CPU seconds, taken with a timestamp."""
+    procs = {}
+    for proc in psutil.process_iter(ATTRS):
+        info = proc.info
+        times = info["cpu_times"]
+        info["cpu_total"] = times.user + times.system if times else 0.0
+        procs[info["pid"]] = info
+    return time.monotonic(), procs
+
+def cpu_rows(before, after):
+    """Rows with CPU% from the difference between two snapshots (100% = one core, as in top)."""
+    (t0, old), (t1, new) = before, after
+    elapsed = max(t1 - t0, 1e-6)
+    rows = []
+    for pid, info in new.items():
+        previous = old.get(pid)
+        used = info["cpu_total"] - previous["cpu_total"] if previous else 0.0
+        memory = info["memory_info"]
+        rows.append({
+            "pid": pid,
+            "name": info["name"] or "?",
+            "user": info["username"] or "?",
+            "cpu": max(used, 0.0) / elapsed * 100,
+            "rss": memory.rss if memory else 0,
+        })
+    return rows
+
+class Processes:
+    def __init__(self):
+        self.total_memory = psutil.virtual_memory().total
+        # formatted cells per pid, reused while a process's values are unchanged
+        self.cells = {}
+
+    def parse(self, args):
+        options = {"sort": "cpu", "filter": None, "user": None, "limit": None, "watch": None}
+        args = list(args)
+        while args:
+            arg = args.pop(0)
+            if arg in ("-s", "--sort"):
+                options["sort"] = args.pop(0).lower()
+                if options["sort"] not in SORT_KEYS:
+                    raise ValueError(f"unknown sort key {options['sort']} (cpu, mem, pid, name)")
+            elif arg in ("-f", "--filter"):
+                options["filter"] = name_matcher(args.pop(0))
+            elif arg in ("-u", "--user"):
+                options["user"] = args.pop(0)
+            elif arg in ("-n", "--limit"):
+                options["limit"] = int(args.pop(0))
+            elif arg in ("-w", "--watch"):
+                options["watch"] = float(args.pop(0)) if args and not args[0].startswith("-") else 2.0
+            else:
+                raise ValueError(f"unknown option {arg}")
+        return options
+
+    def select(self, rows, options):
+        if options["filter"]:
+            rows = [row for row in rows if options["filter"](row["name"])]
+        if options["user"]:
+            rows = [row for row in rows if row["user"] == options["user"]]
+        rows.sort(key=SORT_KEYS[options["sort"]], reverse=options["sort"] != "name")
+        return rows[:options["limit"]] if options["limit"] else rows
+
+    def row_cells(self, row):
+        key = (row["name"], row["user"], round(row["cpu"], 1), row["rss"])
+        cached = self.cells.get(row["pid"])
+        if cached and cached[0] == key:
+            return cached[1]
+        cells = (str(row["pid"]), row["user"], f"{row['cpu']:.1f}",
+                 f"{row['rss'] / self.total_memory * 100:.1f}", format_size(row["rss"]), row["name"])
+        self.cells[row["pid"]] = (key, cells)
+        return cells
+
+    def table(self, rows, total):
+        table = Table(title=f"Processes ({len(rows)} of {total})", style="cyan")
+        table.add_column("PID", justify="right", style="bold yellow")
+        table.add_column("User")
+        table.add_column("CPU%", justify="right", style="bold green")
+        table.add_column("MEM%", justify="right")
+        table.add_column("RSS", justify="right")
+        table.add_column("Name", style="bold")
+        for row in rows:
+            table.add_row(*self.row_cells(row))
+        return table
+
+    def list_processes(self, args):
+        """processes [--sort cpu|mem|pid|name] [--filter PATTERN] [--user NAME] [-n N] [--watch [SECONDS]]"""
+        try:
+            options = self.parse(args)
+        except (ValueError, IndexError) as e:
+            console.print(f"processes: {e or 'missing argument'}", style="bold red", markup=False)
+            console.print("Usage: processes [--sort cpu|mem|pid|name] [--filter PATTERN] [--user NAME] [-n N] [--watch [SECONDS]]",
+                          style="bold yellow", markup=False)
+            return
+        previous = snapshot()
+        time.sleep(SAMPLE_INTERVAL)
+        current = snapshot()
+        rows = self.select(cpu_rows(previous, current), options)
+        if options["watch"] is None:
+            console.print(self.table(rows, len(current[1])))
+            return
+
+        if options["limit"] is None:
+            options["limit"] = max(5, console.size.height - 8)
+        shown = [self.row_cells(row) for row in rows]
+        try:
+            with Live(self.table(rows, len(current[1])), console=console, auto_refresh=False, transient=False) as live:
+                while True:
+                    time.sleep(options["watch"])
+                    # the last snapshot is the first sample of the next interval: one pass per refresh
+                    previous, current = current, snapshot()
+                    rows = self.select(cpu_rows(previous, current), options)
+                    cells = [self.row_cells(row) for row in rows]
+                    if cells != shown:
+                        shown = cells
+                        live.update(self.table(rows, len(current[1])), refresh=True)
+                    alive = current[1].keys()
+                    for pid in [pid for pid in self.cells if pid not in alive]:
+                        del self.cells[pid]
+        except KeyboardInterrupt:
+            pass
+
+    def kill(self, args):
+        """kill [-9] [-y] PID [PID ...] | PATTERN: terminate processes by PID or by name."""
+        force = "-9" in args
+        confirmed = "-y" in args
+        targets = [arg for arg in args if arg not in ("-9", "-y")]
+        if not targets:
+            console.print("Usage: kill [-9] [-y] PID [PID ...] | kill [-9] [-y] NAME_PATTERN", style="bold red", markup=False)
+            return
+
+        procs, missing = [], []
+        if all(target.isdigit() for target in targets):
+            for pid in map(int, targets):
+                try:
+                    procs.append(psutil.Process(pid))
+                except psutil.NoSuchProcess:
+                    missing.append(pid)
+        else:
+            matchers = [name_matcher(target) for target in targets]
+            for proc in psutil.process_iter(["pid", "name"]):
+                if proc.pid != os.getpid() and any(match(proc.info["name"]) for match in matchers):
+                    procs.append(proc)
+            if not procs:
+                console.print(f"No process matches {' '.join(targets)}", style="bold yellow", markup=False)
+                return
+            names = ", ".join(f"{p.info['name']} ({p.pid})" for p in procs[:10])
+            more = f" and {len(procs) - 10} more" if len(procs) > 10 else ""
+            if not confirmed and not Confirm.ask(f"Kill {len(procs)} process(es): {names}{more}?", console=console):
+                return
+
+        for pid in missing:
+            console.print(f"No process with PID {pid}", style="bold yellow")
+        for proc in procs:
+            try:
+                proc.kill() if force else proc.terminate()
+            except psutil.Error as e:
+                console.print(f"{proc.pid}: {e}", style="bold red", markup=False)
+        gone, alive = psutil.wait_procs(procs, timeout=3)
+        for proc in gone:
+            console.print(f"Process {proc.pid} terminated", style="bold red")
+        for proc in alive:
+            console.print(f"Process {proc.pid} is still running (try kill -9 {proc.pid})", style="bold yellow")
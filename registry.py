@@ -0,0 +1,89 @@
+# Lazy Command Registry
+
+import importlib, threading, time
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+lock = threading.Lock()
+
+class CommandRegistry:
+    """Maps command names to module paths and imports a module on first use."""
+
+    def __init__(self):
+        self.entries = {}
+        self.modules = {}
+        self.instances = {}
+        self.import_times = {}
+
+    def register(self, name, module, target, call=None):
+        """Records a command; `target` is 'func' or 'Class.method' inside `module`."""
+        self.entries[name] = (module, target, call)
+
+    def add(self, name, func):
+        """Registers an already-loaded callable (built-ins living in main.py)."""
+        self.entries[name] = (None, func, None)
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def names(self):
+        return sorted(self.entries)
+
+    def load_module(self, module):
+        """Imports a module once and records how long the first import took."""
+        with lock:
+            if module not in self.modules:
+                start = time.perf_counter()
+                self.modules[module] = importlib.import_module(module)
+                self.import_times[module] = time.perf_counter() - start
+            return self.modules[module]
+
+    def instance(self, module, class_name):
+        """Returns the shared instance of `class_name`, importing its module if needed."""
+        key = (module, class_name)
+        if key not in self.instances:
+            cls = getattr(self.load_module(module), class_name)
+            self.instances[key] = cls()
+        return self.instances[key]
+
+    def resolve(self, name):
+        module, target, _ = self.entries[name]
+        if module is None:
+            return target
+        if "." in target:
+            class_name, method = target.split(".", 1)
+            return getattr(self.instance(module, class_name), method)
+        return getattr(self.load_module(module), target)
+
+    def run(self, name, args):
+        func = self.resolve(name)
+        call = self.entries[name][2]
+        return call(func, args) if call else func(args)
+
+    def warm_up(self):
+        """Imports every registered module (used by the startup profile)."""
+        for module in sorted({m for m, _, _ in self.entries.values() if m}):
+            try:
+                self.load_module(module)
+            except Exception as e:
+                console.print(f"Could not import {module}: {e}", style="bold red")
+
+    def startup_report(self, core_time):
+        """Prints per-module import time so startup regressions are easy to spot."""
+        table = Table(title="PyShell Startup Profile", style="cyan")
+        table.add_column("Module", style="bold yellow")
+        table.add_column("Commands", justify="right")
+        table.add_column("Import time (ms)", justify="right", style="bold green")
+
+        counts = {}
+        for module, _, _ in self.entries.values():
+            if module:
+                counts[module] = counts.get(module, 0) + 1
+
+        table.add_row("core (main.py)", "-", f"{core_time * 1000:.1f}")
+        for module, seconds in sorted(self.import_times.items(), key=lambda kv: kv[1], reverse=True):
+            table.add_row(module, str(counts.get(module, 0)), f"{seconds * 1000:.1f}")
+        console.print(table)
+        lazy_total = sum(self.import_times.values())
+        console.print(f"Time to prompt: {core_time * 1000:.1f} ms (deferred: {lazy_total * 1000:.1f} ms)", style="bold yellow")
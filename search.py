@@ -0,0 +1,173 @@
+# Parallel find/grep engine
+
+import fnmatch, math, mmap, os, re, time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from shared import DEFAULT_WORKERS
+
+SKIP_DIRS = {".git"}
+BINARY_SNIFF = 8192
+SIZE_UNITS = {"": 1, "c": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+
+def scan_dir(folder, skip):
+    """Lists one directory; returns (entries, subdirectories to descend into)."""
+    entries, subdirs = [], []
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in skip:
+                        continue
+                    subdirs.append(entry.path)
+                entries.append(entry)
+    except OSError:
+        pass
+    return entries, subdirs
+
+def walk(roots, pool, skip=SKIP_DIRS):
+    """Yields DirEntry objects from all roots, scanning directories concurrently on `pool`.
+
+    Directories are handed out as soon as they are discovered, so entries
+    stream back in completion order rather than after the whole tree is read.
+    """
+    pending = set()
+    for root in roots:
+        if os.path.isdir(root):
+            pending.add(pool.submit(scan_dir, root, skip))
+        elif os.path.exists(root):
+            folder = os.path.dirname(os.path.abspath(root))
+            for entry in os.scandir(folder):
+                if entry.name == os.path.basename(root):
+                    yield entry
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            entries, subdirs = future.result()
+            for subdir in subdirs:
+                pending.add(pool.submit(scan_dir, subdir, skip))
+            yield from entries
+
+# find
+def parse_size(text):
+    """'+10M' -> ('+', 10 MiB); sign is '+' (larger), '-' (smaller) or '' (exactly)."""
+    sign = text[0] if text[0] in "+-" else ""
+    body = text.lstrip("+-").lower()
+    unit = body[-1] if body and body[-1] in SIZE_UNITS else ""
+    return sign, int(body[:len(body) - len(unit)] if unit else body) * SIZE_UNITS[unit]
+
+def compare(sign, value, limit):
+    if sign == "+":
+        return value > limit
+    if sign == "-":
+        return value < limit
+    return value == limit
+
+class FindFilter:
+    """Predicates for find: -name GLOB, -iname GLOB, -type f|d|l, -size [+-]N[kMG], -mtime [+-]DAYS."""
+
+    def __init__(self, name=None, iname=None, kind=None, size=None, mtime=None):
+        self.name = name
+        self.iname = iname.lower() if iname else None
+        self.kind = kind
+        self.size = parse_size(size) if size else None
+        self.mtime = (mtime[0] if mtime[0] in "+-" else "", int(mtime.lstrip("+-"))) if mtime else None
+        self.now = time.time()
+
+    def matches(self, entry):
+        if self.name and not fnmatch.fnmatchcase(entry.name, self.name):
+            return False
+        if self.iname and not fnmatch.fnmatchcase(entry.name.lower(), self.iname):
+            return False
+        if self.kind:
+            if self.kind == "l" and not entry.is_symlink():
+                return False
+            if self.kind == "d" and not entry.is_dir(follow_symlinks=False):
+                return False
+            if self.kind == "f" and not entry.is_file(follow_symlinks=False):
+                return False
+        if self.size or self.mtime:
+            try:
+                info = entry.stat(follow_symlinks=False)
+            except OSError:
+                return False
+            if self.size and not compare(self.size[0], info.st_size, self.size[1]):
+                return False
+            if self.mtime:
+                # like find: age in whole days, fractions dropped, so -mtime 0 is "within the last 24h"
+                days = math.floor((self.now - info.st_mtime) / 86400)
+                if not compare(self.mtime[0], days, self.mtime[1]):
+                    return False
+        return True
+
+def find(roots, predicate, workers=DEFAULT_WORKERS, skip=SKIP_DIRS):
+    """Yields matching paths as they are found."""
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="find") as pool:
+        for entry in walk(roots, pool, skip):
+            if predicate.matches(entry):
+                yield entry.path
+
+# grep
+def compile_pattern(pattern, ignore_case=False):
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+    return re.compile(pattern.encode("utf-8", "surrogateescape"), flags)
+
+def is_binary(data):
+    return b"\0" in data[:BINARY_SNIFF]
+
+def grep_file(path, regex, mode="lines", emit=None):
+    """Searches one file through mmap without reading it into memory.
+
+    mode is "lines" (emit every matching line), "files" (-l: stop at the first
+    match) or "count" (-c). Returns the number of matching lines; -1 for skipped
+    binary or unreadable files.
+    """
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return 0
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if is_binary(mm):
+                    return -1
+                count = 0
+                pos = 0
+                size = len(mm)
+                while pos <= size:
+                    match = regex.search(mm, pos)
+                    if not match:
+                        break
+                    count += 1
+                    if mode == "files":
+                        break
+                    end = mm.find(b"\n", match.end())
+                    end = size if end == -1 else end
+                    if mode == "lines":
+                        start = mm.rfind(b"\n", 0, match.start()) + 1
+                        emit(mm[start:end].decode("utf-8", "replace"))
+                    # one hit per line, like grep
+                    pos = end + 1
+                return count
+    except (OSError, ValueError):
+        return -1
+
+def grep_many(paths, regex, mode, workers=DEFAULT_WORKERS):
+    """Searches files concurrently; yields (path, count, lines) as each file finishes."""
+    def search(path):
+        lines = []
+        return path, grep_file(path, regex, mode, lines.append), lines
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="grep") as pool:
+        pending = set()
+        for path in paths:
+            pending.add(pool.submit(search, path))
+            if len(pending) >= workers * 4:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in pending:
+            yield future.result()
+
+def walk_files(roots, workers=DEFAULT_WORKERS, skip=SKIP_DIRS):
+    """Regular files under `roots` (found with the parallel walker)."""
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="walk") as pool:
+        for entry in walk(roots, pool, skip):
+            if entry.is_file(follow_symlinks=False):
+                yield entry.path
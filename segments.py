@@ -0,0 +1,180 @@
+# Prompt Segment Provider
+
+import os, socket, subprocess, threading, time
+from datetime import datetime
+import psutil
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from gitinfo import find_repo, read_head
+
+class SegmentProvider:
+    """Caches prompt segments (branch, dirty count, memory, hostname, time) with per-segment TTLs.
+
+    Git segments are also keyed on the current directory and on the mtimes of
+    .git/HEAD and .git/index, so a checkout or `git add` shows up on the next
+    prompt even before the TTL runs out.
+
+    Segments registered with a placeholder are computed on a background pool.
+    `prefetch()` starts all stale ones at once; a segment that is not ready
+    within `deadline` seconds renders as its placeholder, and the `on_ready`
+    callback fires once every late segment has arrived.
+    """
+
+    def __init__(self, deadline=0.05, workers=4):
+        self.lock = threading.RLock()
+        self.segments = {}
+        self.cache = {}
+        self.pending = {}
+        self.deadline = deadline
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="segment")
+        self.round = 0
+        self.round_start = 0.0
+        self.rendering = False
+        self.late = set()
+        self.waited = set()
+        self.on_ready = None
+
+    def register(self, name, compute, ttl=None, git=False, placeholder=None):
+        """`ttl` is in seconds (None caches until invalidated)."""
+        self.segments[name] = (compute, ttl, git, placeholder)
+
+    def fresh(self, name, key, now):
+        cached = self.cache.get(name)
+        if cached:
+            value, expires, cached_key = cached
+            if cached_key == key and (expires is None or now < expires):
+                return True, value
+        return False, None
+
+    def submit(self, name, key):
+        """Starts computing `name` in the background unless it is already running."""
+        compute, ttl, _, _ = self.segments[name]
+        with self.lock:
+            running = self.pending.get(name)
+            if running and running[1] == key:
+                return running[0]
+            future = self.pool.submit(compute)
+            self.pending[name] = (future, key)
+        future.add_done_callback(lambda f: self.finish(name, key, ttl, f))
+        return future
+
+    def finish(self, name, key, ttl, future):
+        with self.lock:
+            if self.pending.get(name, (None,))[0] is future:
+                del self.pending[name]
+            try:
+                value = future.result()
+            except Exception:
+                value = None
+            self.cache[name] = (value, None if ttl is None else time.monotonic() + ttl, key)
+            self.late.discard(name)
+            callback = self.on_ready if not self.late and name in self.waited else None
+            self.waited.discard(name)
+        if callback:
+            callback()
+
+    def prefetch(self, on_ready=None):
+        """Starts a render round: every stale background segment is computed concurrently."""
+        now = time.monotonic()
+        key = None
+        with self.lock:
+            self.round += 1
+            self.round_start = now
+            self.rendering = True
+            self.late = set()
+            self.waited = set()
+            self.on_ready = on_ready
+        for name, (_, _, git, placeholder) in self.segments.items():
+            if placeholder is None:
+                continue
+            if git and key is None:
+                key = self.git_signature()
+            segment_key = key if git else None
+            with self.lock:
+                ready, _ = self.fresh(name, segment_key, now)
+            if not ready:
+                self.submit(name, segment_key)
+
+    def end_round(self):
+        """Marks the prompt as drawn; later lookups wait the full deadline again."""
+        with self.lock:
+            self.rendering = False
+
+    def get(self, name):
+        compute, ttl, git, placeholder = self.segments[name]
+        now = time.monotonic()
+        key = self.git_signature() if git else None
+        with self.lock:
+            ready, value = self.fresh(name, key, now)
+        if ready:
+            return value
+        if placeholder is None:
+            value = compute()
+            with self.lock:
+                self.cache[name] = (value, None if ttl is None else now + ttl, key)
+            return value
+
+        future = self.submit(name, key)
+        rendering = self.rendering
+        timeout = max(self.round_start + self.deadline - now, 0) if rendering else self.deadline
+        try:
+            return future.result(timeout=timeout)
+        except FuturesTimeout:
+            if rendering:
+                with self.lock:
+                    self.late.add(name)
+                    self.waited.add(name)
+                    if future.done():
+                        # finished between the timeout and registering as late
+                        self.late.discard(name)
+                        self.waited.discard(name)
+                        return future.result()
+            return placeholder
+        except Exception:
+            return None
+
+    def invalidate(self, *names):
+        """Drops the given segments (all of them when called without names)."""
+        with self.lock:
+            if not names:
+                self.cache.clear()
+            for name in names:
+                self.cache.pop(name, None)
+
+    def invalidate_git(self):
+        find_repo.cache_clear()
+        self.invalidate(*[name for name, (_, _, git, _) in self.segments.items() if git])
+
+    def git_signature(self):
+        cwd = os.getcwd()
+        repo = find_repo(cwd)
+        if not repo:
+            return (cwd, None)
+        git_dir = repo[1]
+        return (cwd, git_dir, mtime_ns(os.path.join(git_dir, "HEAD")), mtime_ns(os.path.join(git_dir, "index")))
+
+def mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def git_output(*args):
+    try:
+        return subprocess.check_output(["git", *args], stderr=subprocess.DEVNULL).decode().strip()
+    except (subprocess.CalledProcessError, OSError):
+        return None
+
+# Segments
+def current_branch():
+    return read_head(os.getcwd())
+
+def dirty_count():
+    status = git_output("status", "--porcelain")
+    return len(status.splitlines()) if status else 0
+
+segments = SegmentProvider()
+segments.register("branch", current_branch, ttl=30, git=True, placeholder="…")
+segments.register("changes", dirty_count, ttl=5, git=True, placeholder="…")
+segments.register("memory", psutil.virtual_memory, ttl=2)
+segments.register("hostname", socket.gethostname)
+segments.register("time", datetime.now, ttl=1)
@@ -0,0 +1,115 @@
+# User Settings Store
+
+import json, os, tempfile, threading
+
+# setting -> (default, accepted types)
+SCHEMA = {
+    "terminal_layout": (5, (int, str)),
+    "prompt_deadline": (0.05, (int, float)),
+    "password_scheme": ("scrypt", (str,)),
+    "scrypt_n": (2 ** 14, (int,)),
+    "scrypt_r": (8, (int,)),
+    "scrypt_p": (1, (int,)),
+    "pbkdf2_iterations": (600000, (int,)),
+    "external_ip_url": ("https://api64.ipify.org", (str,)),
+    "external_ip_timeout": (2.0, (int, float)),
+    "symbolic_timeout": (30, (int, float)),
+}
+
+def config_dir():
+    """Per-user PyShell config directory (XDG on Linux/macOS, %APPDATA% on Windows)."""
+    if os.name == "nt":
+        base = os.getenv("APPDATA") or os.path.expanduser("~")
+    else:
+        base = os.getenv("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    return os.path.join(base, "pyshell")
+
+def cache_dir():
+    """Per-user cache directory for rebuildable data such as the du size index."""
+    if os.name == "nt":
+        base = os.getenv("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "pyshell")
+
+def defaults_path():
+    """Shared read-only defaults, e.g. provisioned for a whole fleet of hosts."""
+    if os.getenv("PYSHELL_DEFAULTS"):
+        return os.getenv("PYSHELL_DEFAULTS")
+    if os.name == "nt":
+        return os.path.join(os.getenv("PROGRAMDATA", "C:\\ProgramData"), "pyshell", "settings.json")
+    return "/etc/pyshell/settings.json"
+
+def read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def atomic_write_json(path, data):
+    """Writes to a temp file in the same directory, then renames it over `path`."""
+    folder = os.path.dirname(path)
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".settings-", suffix=".tmp", dir=folder)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+class Settings:
+    """Typed settings loaded once: built-in defaults < shared defaults file < user overrides.
+
+    Only the user's overrides are ever written back; lookups never touch disk.
+    """
+
+    def __init__(self, user_path=None, shared_path=None):
+        self.lock = threading.Lock()
+        self.user_path = user_path or os.path.join(config_dir(), "settings.json")
+        self.shared_path = shared_path or defaults_path()
+        self.load()
+
+    def validate(self, key, value):
+        if key not in SCHEMA:
+            raise KeyError(f"Unknown setting '{key}'")
+        types = SCHEMA[key][1]
+        if isinstance(value, bool) or not isinstance(value, types):
+            names = "/".join(t.__name__ for t in types)
+            raise TypeError(f"Setting '{key}' must be {names}, got {type(value).__name__}")
+        return value
+
+    def merge(self, data):
+        merged = {}
+        for key, value in data.items():
+            try:
+                merged[key] = self.validate(key, value)
+            except (KeyError, TypeError):
+                continue
+        return merged
+
+    def load(self):
+        with self.lock:
+            self.overrides = self.merge(read_json(self.user_path))
+            self.values = {key: default for key, (default, _) in SCHEMA.items()}
+            self.values.update(self.merge(read_json(self.shared_path)))
+            self.values.update(self.overrides)
+
+    def get(self, key):
+        return self.values[key]
+
+    def set(self, key, value):
+        """Updates a setting in memory and persists the user's overrides atomically."""
+        value = self.validate(key, value)
+        with self.lock:
+            self.overrides[key] = value
+            self.values[key] = value
+            atomic_write_json(self.user_path, self.overrides)
+
+settings = Settings()
@@ -0,0 +1,12 @@
+# Helpers shared by the file and process commands
+
+import os
+
+# thread pools for I/O-bound work (scandir, stat, copying, hashing) overlap waits, so use more threads than cores
+DEFAULT_WORKERS = min(16, (os.cpu_count() or 2) * 2)
+
+def format_size(size):
+    for unit in ("B", "K", "M", "G", "T"):
+        if size < 1024 or unit == "T":
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
@@ -0,0 +1,149 @@
+# Symbolic math worker (sympy jobs in a separate process, memoized on disk)
+#
+# The shell talks to one long-lived worker over JSON lines on stdin/stdout.
+# Expressions cross the boundary as sympy srepr strings, which are also the
+# memo key, so equal inputs hit the cache however they were typed.
+
+import hashlib, json, os, queue, sqlite3, subprocess, sys, threading, time
+
+SCHEMA = "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, result TEXT NOT NULL)"
+
+class SymbolicTimeout(Exception):
+    pass
+
+class SymbolicCancelled(Exception):
+    pass
+
+class SymbolicError(Exception):
+    pass
+
+# Jobs (run inside the worker)
+def job_diff(expression, variable):
+    from sympy import diff, srepr, sympify
+    return srepr(diff(sympify(expression), sympify(variable)))
+
+def job_integrate(expression, variable):
+    from sympy import integrate, srepr, sympify
+    return srepr(integrate(sympify(expression), sympify(variable)))
+
+def job_solve(equations, variables):
+    from sympy import solve, srepr, sympify
+    solutions = solve([sympify(eq) for eq in equations], [sympify(v) for v in variables], dict=True)
+    return [[[srepr(k), srepr(v)] for k, v in solution.items()] for solution in solutions]
+
+def job_dsolve(equation, function):
+    from sympy import dsolve, srepr, sympify
+    return srepr(dsolve(sympify(equation), sympify(function)))
+
+JOBS = {"diff": job_diff, "integrate": job_integrate, "solve": job_solve, "dsolve": job_dsolve}
+
+def serve():
+    """Worker loop: one JSON request per line in, one JSON reply per line out."""
+    import sympy  # noqa: F401  (imported once, up front, so the first job is not slower)
+    out = sys.stdout
+    sys.stdout = sys.stderr
+    for line in sys.stdin:
+        kind, args = json.loads(line)
+        try:
+            reply = ["ok", JOBS[kind](*args)]
+        except Exception as e:
+            reply = ["error", f"{type(e).__name__}: {e}"]
+        out.write(json.dumps(reply) + "\n")
+        out.flush()
+
+# Client (runs in the shell)
+class SymbolicEngine:
+    """Runs sympy jobs in a reusable worker process with a timeout and Ctrl-C cancellation.
+
+    A job that times out or is interrupted kills the worker; the next job
+    starts a fresh one. Successful results are stored in SQLite, keyed by the
+    job kind and the srepr of its inputs.
+    """
+
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path
+        self.process = None
+        self.replies = None
+        self.db = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        # own session: Ctrl-C at the prompt reaches only the shell, which decides what to cancel
+        self.process = subprocess.Popen([sys.executable, os.path.abspath(__file__)], stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE, text=True, bufsize=1,
+                                        start_new_session=os.name != "nt")
+        self.replies = queue.Queue()
+        threading.Thread(target=self.read_replies, args=(self.process, self.replies), daemon=True).start()
+
+    @staticmethod
+    def read_replies(process, replies):
+        for line in process.stdout:
+            replies.put(json.loads(line))
+        replies.put(["error", "symbolic worker exited"])
+
+    def stop(self):
+        if self.process:
+            self.process.kill()
+            self.process.wait()
+            self.process = None
+
+    def database(self):
+        if self.db is None:
+            from settings import cache_dir
+            path = self.cache_path or os.path.join(cache_dir(), "symbolic.sqlite3")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute(SCHEMA)
+        return self.db
+
+    def run(self, kind, args, timeout=None):
+        """Returns the job's result, from the memo if this exact input was solved before."""
+        key = hashlib.sha256(json.dumps([kind, args]).encode()).hexdigest()
+        with self.lock:
+            row = self.database().execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+            if row:
+                return json.loads(row[0])
+            if self.process is None or self.process.poll() is not None:
+                self.start()
+            self.process.stdin.write(json.dumps([kind, args]) + "\n")
+            self.process.stdin.flush()
+            deadline = None if timeout is None else time.monotonic() + timeout
+            try:
+                while True:
+                    # short waits keep the main thread responsive to Ctrl-C
+                    wait = 0.2 if deadline is None else min(0.2, deadline - time.monotonic())
+                    if wait <= 0:
+                        self.stop()
+                        raise SymbolicTimeout(f"gave up after {timeout:g}s (pass --timeout or raise symbolic_timeout in settings.json)")
+                    try:
+                        status, result = self.replies.get(timeout=wait)
+                        break
+                    except queue.Empty:
+                        continue
+            except KeyboardInterrupt:
+                self.stop()
+                raise SymbolicCancelled("cancelled")
+            if status != "ok":
+                if self.process and self.process.poll() is not None:
+                    self.process = None
+                raise SymbolicError(result)
+            with self.database():
+                self.db.execute("INSERT OR REPLACE INTO results VALUES (?, ?)", (key, json.dumps(result)))
+            return result
+
+engine = SymbolicEngine()
+
+def pop_timeout(args):
+    """Removes '--timeout S' from a command's args; returns (args, seconds from the flag or settings)."""
+    from settings import settings
+    args = list(args)
+    if "--timeout" in args:
+        at = args.index("--timeout")
+        seconds = float(args[at + 1])
+        del args[at:at + 2]
+        return args, seconds
+    return args, settings.get("symbolic_timeout")
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,100 @@
+# User Store (SQLite)
+
+import json, os, sqlite3, threading
+from settings import config_dir
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT NOT NULL,
+    password TEXT NOT NULL,
+    role     TEXT NOT NULL DEFAULT 'user'
+);
+CREATE UNIQUE INDEX IF NOT EXISTS users_username ON users (username);
+"""
+
+def default_path():
+    return os.getenv("PYSHELL_USER_DB") or os.path.join(config_dir(), "users.sqlite3")
+
+class UserStore:
+    """Users in an indexed SQLite table (WAL mode), safe for many PyShell processes at once.
+
+    Each thread gets its own connection. Lookups go through the unique index on
+    username, and registration is a single INSERT so two shells racing to
+    create the same user cannot both succeed.
+    """
+
+    def __init__(self, path=None, legacy_json=None):
+        self.path = path or default_path()
+        self.local = threading.local()
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with self.connect() as db:
+            db.executescript(SCHEMA)
+        if legacy_json:
+            self.migrate_json(legacy_json)
+
+    def connect(self):
+        db = getattr(self.local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self.local.db = db
+        return db
+
+    def get(self, username):
+        """Returns {"password": ..., "role": ...} or None."""
+        row = self.connect().execute(
+            "SELECT password, role FROM users WHERE username = ?", (username,)
+        ).fetchone()
+        return {"password": row[0], "role": row[1]} if row else None
+
+    def exists(self, username):
+        return self.get(username) is not None
+
+    def add(self, username, password, role="user"):
+        """Creates a user; returns False if the name is already taken."""
+        with self.connect() as db:
+            cursor = db.execute(
+                "INSERT INTO users (username, password, role) VALUES (?, ?, ?) ON CONFLICT(username) DO NOTHING",
+                (username, password, role),
+            )
+        return cursor.rowcount == 1
+
+    def upsert(self, username, password, role="user"):
+        with self.connect() as db:
+            db.execute(
+                "INSERT INTO users (username, password, role) VALUES (?, ?, ?) "
+                "ON CONFLICT(username) DO UPDATE SET password = excluded.password, role = excluded.role",
+                (username, password, role),
+            )
+
+    def set_password(self, username, password):
+        with self.connect() as db:
+            db.execute("UPDATE users SET password = ? WHERE username = ?", (password, username))
+
+    def migrate_json(self, path):
+        """Imports users.json once (tracked with PRAGMA user_version); existing users win.
+
+        The JSON file itself is left untouched (it is tracked in the repository),
+        so any plaintext passwords in it stay there; only the SQLite copies are
+        re-hashed on login.
+        """
+        db = self.connect()
+        if db.execute("PRAGMA user_version").fetchone()[0] >= 1:
+            return 0
+        try:
+            with open(path, "r") as f:
+                users = json.load(f)
+        except (OSError, ValueError):
+            users = {}
+        rows = [(name, str(info.get("password", "")), info.get("role", "user")) for name, info in users.items()]
+        with db:
+            before = db.total_changes
+            db.executemany(
+                "INSERT INTO users (username, password, role) VALUES (?, ?, ?) ON CONFLICT(username) DO NOTHING",
+                rows,
+            )
+            db.execute("PRAGMA user_version = 1")
+            return db.total_changes - before
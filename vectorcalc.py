@@ -0,0 +1,146 @@
+# Vectorized calc over ranges and CSV columns
+
+import math
+import numpy as np
+import mathexpr
+
+CHUNK = 1 << 20
+
+def log(x, base=None):
+    return np.log(x) if base is None else np.log(x) / np.log(base)
+
+def whole(x, name):
+    """Float arrays (what ranges and CSV columns give) as int64, if every value is a whole number."""
+    x = np.asarray(x)
+    if x.dtype.kind in "iu":
+        return x
+    if not np.all(np.isfinite(x) & (x == np.round(x))):
+        raise ValueError(f"{name}() needs whole numbers in vector mode")
+    return x.astype(np.int64)
+
+def gcd(a, b):
+    return np.gcd(whole(a, "gcd"), whole(b, "gcd"))
+
+def lcm(a, b):
+    return np.lcm(whole(a, "lcm"), whole(b, "lcm"))
+
+def factorial(x):
+    from scipy.special import gamma
+    return gamma(np.asarray(x, dtype=float) + 1)
+
+# the scalar calc names, mapped onto ufuncs that work on whole arrays
+UFUNCS = {
+    "abs": np.abs, "fabs": np.fabs, "ceil": np.ceil, "floor": np.floor, "trunc": np.trunc,
+    "exp": np.exp, "expm1": np.expm1, "log": log, "log10": np.log10, "log2": np.log2, "log1p": np.log1p,
+    "sqrt": np.sqrt, "cbrt": np.cbrt, "pow": np.power, "__pow__": np.power,
+    "sin": np.sin, "cos": np.cos, "tan": np.tan, "asin": np.arcsin, "acos": np.arccos, "atan": np.arctan,
+    "atan2": np.arctan2, "hypot": np.hypot, "sinh": np.sinh, "cosh": np.cosh, "tanh": np.tanh,
+    "asinh": np.arcsinh, "acosh": np.arccosh, "atanh": np.arctanh,
+    "degrees": np.degrees, "radians": np.radians, "gcd": gcd, "lcm": lcm, "factorial": factorial,
+    "isfinite": np.isfinite, "isinf": np.isinf, "isnan": np.isnan, "copysign": np.copysign, "fmod": np.fmod,
+    "round": np.round, "min": np.minimum, "max": np.maximum,
+    "pi": math.pi, "e": math.e, "tau": math.tau, "inf": math.inf, "nan": math.nan,
+}
+
+def parse_range(text, step=None):
+    """'0..10' plus an optional step -> (start, stop, step); both ends included."""
+    start, _, stop = text.partition("..")
+    start, stop = float(start), float(stop)
+    step = float(step) if step is not None else 1.0
+    if step <= 0 or stop < start:
+        raise ValueError("range must be increasing with a positive step")
+    return start, stop, step
+
+def range_chunks(start, stop, step, chunk=CHUNK):
+    # computed from an integer index so rounding never accumulates across chunks
+    count = int(math.floor((stop - start) / step + 1e-9)) + 1
+    for first in range(0, count, chunk):
+        yield start + step * np.arange(first, min(first + chunk, count), dtype=float)
+
+def read_column(spec):
+    """'@data.csv:col2' -> column by header name, or by 1-based number ('@data.csv:3')."""
+    path, _, column = spec[1:].rpartition(":")
+    if not path:
+        path, column = spec[1:], "1"
+    with open(path, "r", encoding="utf-8") as f:
+        first = f.readline().strip().split(",")
+    cells = [cell.strip().strip('"') for cell in first]
+    try:
+        [float(cell) for cell in cells]
+        header = None
+    except ValueError:
+        header = cells
+    if header and column in header:
+        index = header.index(column)
+    elif column.isdigit() and 1 <= int(column) <= len(cells):
+        index = int(column) - 1
+    else:
+        raise ValueError(f"no column '{column}' in {path}")
+    return np.loadtxt(path, delimiter=",", usecols=index, skiprows=1 if header else 0, ndmin=1, dtype=float)
+
+def array_chunks(values, chunk=CHUNK):
+    for first in range(0, len(values), chunk):
+        yield values[first:first + chunk]
+
+class Summary:
+    """Running count/min/max/mean/std over chunks (Chan's parallel variance update)."""
+
+    def __init__(self):
+        self.count = self.nan = 0
+        self.mean = self.m2 = self.total = 0.0
+        self.low, self.high = math.inf, -math.inf
+
+    def add(self, values):
+        finite = values[np.isfinite(values)]
+        self.nan += len(values) - len(finite)
+        n = len(finite)
+        if not n:
+            return
+        mean = float(finite.mean())
+        m2 = float(((finite - mean) ** 2).sum())
+        delta = mean - self.mean
+        total = self.count + n
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.total += float(finite.sum())
+        self.low = min(self.low, float(finite.min()))
+        self.high = max(self.high, float(finite.max()))
+
+    def rows(self):
+        std = math.sqrt(self.m2 / self.count) if self.count else math.nan
+        return [("points", f"{self.count + self.nan}"), ("min", f"{self.low:.10g}"), ("max", f"{self.high:.10g}"),
+                ("mean", f"{self.mean:.10g}"), ("std", f"{std:.10g}"), ("sum", f"{self.total:.10g}"),
+                ("non-finite", f"{self.nan}")]
+
+def evaluate(expression, variable, chunks, out=None):
+    """Evaluates the expression once per chunk of values; returns a Summary.
+
+    With `out`, writes "variable,result" CSV rows chunk by chunk, so memory
+    stays bounded by the chunk size whatever the range length.
+    """
+    namespace = dict(UFUNCS)
+    namespace[variable] = None
+    names = frozenset(namespace)
+    code = mathexpr.compile_expression(expression, names)
+    summary = Summary()
+    for values in chunks:
+        namespace[variable] = values
+        result = np.asarray(eval(code, {"__builtins__": {}}, namespace))
+        if np.iscomplexobj(result):
+            raise ValueError("complex results are not supported in vector mode")
+        result = np.broadcast_to(result.astype(float), values.shape)
+        summary.add(result)
+        if out is not None:
+            np.savetxt(out, np.column_stack((values, result)), delimiter=",", fmt="%.12g")
+    return summary
+
+def run(expression, variable, source, step=None, out_path=None):
+    if not variable.isidentifier() or variable in UFUNCS:
+        raise ValueError(f"invalid variable name '{variable}'")
+    chunks = array_chunks(read_column(source)) if source.startswith("@") else range_chunks(*parse_range(source, step))
+    if out_path is None:
+        return evaluate(expression, variable, chunks)
+    with open(out_path, "w", encoding="utf-8") as out:
+        out.write(f"{variable},result\n")
+        return evaluate(expression, variable, chunks, out)
@@ -0,0 +1,183 @@
+# File change watching (inotify with a polling fallback)
+
+import ctypes, ctypes.util, errno, os, select, struct, sys, time
+
+SKIP_DIRS = {".git", "__pycache__"}
+POLL_INTERVAL = 1.0
+DEBOUNCE = 0.3
+
+IN_MODIFY, IN_ATTRIB, IN_CLOSE_WRITE = 0x2, 0x4, 0x8
+IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE, IN_DELETE = 0x40, 0x80, 0x100, 0x200
+IN_DELETE_SELF, IN_MOVE_SELF = 0x400, 0x800
+IN_Q_OVERFLOW, IN_IGNORED, IN_ISDIR = 0x4000, 0x8000, 0x40000000
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+EVENT = struct.Struct("iIII")
+
+def directories(root):
+    """root and every directory below it, skipping SKIP_DIRS."""
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        yield folder
+        try:
+            with os.scandir(folder) as it:
+                stack.extend(e.path for e in it if e.is_dir(follow_symlinks=False) and e.name not in SKIP_DIRS)
+        except OSError:
+            continue
+
+class InotifyWatcher:
+    """Recursive watch on Linux: one inotify watch per directory, added as directories appear."""
+    method = "inotify"
+
+    def __init__(self, paths):
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}
+        # a single file is watched through its directory, so editors that save
+        # by renaming a new file over it keep being seen
+        self.files = {}
+        try:
+            for path in paths:
+                if os.path.isdir(path):
+                    for folder in directories(path):
+                        self.add(folder)
+                else:
+                    folder, name = os.path.split(os.path.abspath(path))
+                    self.files.setdefault(folder, set()).add(name)
+                    self.add(folder)
+        except OSError:
+            self.close()
+            raise
+
+    def add(self, folder):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(folder), WATCH_MASK)
+        if wd < 0:
+            code = ctypes.get_errno()
+            # ENOSPC: out of watches (fs.inotify.max_user_watches); let the caller fall back to polling
+            if code in (errno.ENOSPC, errno.ENOMEM):
+                raise OSError(code, os.strerror(code))
+            return
+        self.watches[wd] = folder
+
+    def wait(self, timeout=None):
+        """Blocks up to `timeout` seconds (None: forever); returns the set of changed paths."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed = set()
+        pos = 0
+        while pos < len(data):
+            wd, mask, _, length = EVENT.unpack_from(data, pos)
+            name = data[pos + EVENT.size:pos + EVENT.size + length].rstrip(b"\0")
+            pos += EVENT.size + length
+            folder = self.watches.get(wd)
+            if mask & IN_Q_OVERFLOW:
+                changed.add("(event queue overflow)")
+                continue
+            if folder is None:
+                continue
+            if mask & IN_IGNORED:
+                del self.watches[wd]
+                continue
+            name = os.fsdecode(name)
+            if name in SKIP_DIRS:
+                continue
+            if folder in self.files and name not in self.files[folder]:
+                continue
+            path = os.path.join(folder, name) if name else folder
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                for subdir in directories(path):
+                    self.add(subdir)
+            changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+class PollWatcher:
+    """Portable fallback: compares a cached (mtime, size) snapshot of every file each interval."""
+    method = "polling"
+
+    def __init__(self, paths, interval=POLL_INTERVAL):
+        self.paths = paths
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self):
+        snapshot = {}
+        for path in self.paths:
+            for folder in (directories(path) if os.path.isdir(path) else []):
+                try:
+                    with os.scandir(folder) as it:
+                        for entry in it:
+                            try:
+                                info = entry.stat(follow_symlinks=False)
+                            except OSError:
+                                continue
+                            snapshot[entry.path] = (info.st_mtime_ns, info.st_size)
+                except OSError:
+                    continue
+            if not os.path.isdir(path):
+                try:
+                    info = os.stat(path)
+                    snapshot[path] = (info.st_mtime_ns, info.st_size)
+                except OSError:
+                    pass
+        return snapshot
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self.interval if deadline is None else max(0, min(self.interval, deadline - time.monotonic())))
+            current = self.scan()
+            changed = {path for path in current.keys() | self.snapshot.keys()
+                       if current.get(path) != self.snapshot.get(path)}
+            self.snapshot = current
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+def open_watcher(paths, poll=False):
+    """inotify where available, otherwise stat polling."""
+    if not poll:
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError):
+            pass
+    return PollWatcher(paths)
+
+def watch(paths, on_change, debounce=DEBOUNCE, poll=False, on_start=lambda watcher: None):
+    """Calls on_change(changed paths) once per burst of changes until interrupted.
+
+    After the first event, further events are collected until `debounce`
+    seconds pass without any, so a save that touches ten files runs the
+    command once. Changes made while the command runs (often by the command
+    itself) are discarded so it cannot retrigger itself.
+    """
+    watcher = open_watcher(paths, poll)
+    on_start(watcher)
+    try:
+        while True:
+            changed = watcher.wait()
+            while changed:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                changed |= more
+            if changed:
+                on_change(changed)
+                while watcher.wait(0):
+                    pass
+    finally:
+        watcher.close()